@@ -26,6 +26,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.humanize',  # Para humanizar números y fechas
+    'django.contrib.postgres',  # Búsqueda de texto completo (SearchVector, GIN)
 
     # Apps propias
     'usuarios',
@@ -122,6 +123,49 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Los archivos subidos se escriben a un temporal en disco en lugar de quedarse en
+# memoria: una foto de 5 MB no ocupa 5 MB de RAM por petición y el storage la
+# mueve a MEDIA_ROOT sin copiarla
+FILE_UPLOAD_HANDLERS = ['django.core.files.uploadhandler.TemporaryFileUploadHandler']
+
+# 'contenido': fotos de perfil y logos nombrados por el hash de su contenido
+# (usuarios/storage.py). Sus URLs nunca cambian de contenido: en producción el
+# servidor web puede enviar "Cache-Control: public, max-age=31536000, immutable"
+# para MEDIA_URL; en desarrollo lo hace usuarios.views.servir_media.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'contenido': {
+        'BACKEND': 'usuarios.storage.AlmacenamientoContenido',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+# PDFs de CV generados (datos personales: fuera de MEDIA_ROOT, no se sirven directamente)
+CV_PDF_ROOT = BASE_DIR / 'private' / 'cv_pdf'
+
+# Segundos que la descarga de todos los CV de una vacante espera a que el worker
+# (manage.py procesar_pdfs) genere los PDF que faltan
+ESPERA_ZIP_CV = 300
+
+# Caché compartida entre procesos del servidor (resultados de búsqueda, usuarios/cache_busqueda.py).
+# LocMemCache es por proceso y no vería la invalidación hecha por otro worker.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+    },
+    # Contadores de generación (usuarios/cache_busqueda.py): pocas claves, nunca se depuran
+    'generaciones': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'generaciones',
+        'TIMEOUT': None,
+    },
+}
+
 # config/settings.py
 
 # Configuración de correo electrónico (ajustar según proveedor)
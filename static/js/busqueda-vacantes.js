@@ -54,7 +54,7 @@ class BusquedaVacantes {
                 clearTimeout(timeoutId);
                 timeoutId = setTimeout(() => {
                     this.handleLiveSearch(e.target.value);
-                }, 500); // Esperar 500ms después de que el usuario deje de escribir
+                }, 150); // El autocompletado responde desde memoria, basta una espera corta
             });
         }
     }
@@ -124,40 +124,39 @@ class BusquedaVacantes {
     }
 
     handleLiveSearch(query) {
-        // Solo hacer búsqueda en vivo si hay más de 2 caracteres
-        if (query.length > 2) {
+        // Solo pedir sugerencias si hay al menos 2 caracteres
+        if (query.trim().length >= 2) {
             this.mostrarSugerenciasRelacionadas(query);
         }
     }
 
     mostrarSugerenciasRelacionadas(query) {
-        // Buscar en los términos populares que coincidan
-        const terminosRelacionados = [
-            'desarrollador web', 'desarrollador mobile', 'contador público',
-            'vendedor', 'gerente de ventas', 'administrador de sistemas',
-            'ingeniero civil', 'ingeniero sistemas', 'marketing digital'
-        ].filter(termino =>
-            termino.toLowerCase().includes(query.toLowerCase())
-        );
-
-        // Actualizar sugerencias dinámicamente
-        const suggestionsContainer = document.querySelector('.d-flex.flex-wrap.gap-1');
-        if (suggestionsContainer && terminosRelacionados.length > 0) {
-            const nuevasSugerencias = terminosRelacionados.slice(0, 3).map(termino =>
-                `<button type="button" class="btn btn-outline-success btn-sm search-suggestion" data-query="${termino}">
-                    ${termino}
-                </button>`
-            ).join('');
-
-            suggestionsContainer.innerHTML = nuevasSugerencias;
-
-            // Re-agregar event listeners
-            suggestionsContainer.querySelectorAll('.search-suggestion').forEach(btn => {
-                btn.addEventListener('click', (e) => {
-                    this.aplicarSugerencia(e.target.dataset.query);
+        // Cancelar la petición anterior si el usuario siguió escribiendo
+        if (this.autocompletadoController) {
+            this.autocompletadoController.abort();
+        }
+        this.autocompletadoController = new AbortController();
+
+        fetch(`/ajax/autocompletar/?q=${encodeURIComponent(query)}`, {
+            signal: this.autocompletadoController.signal
+        })
+            .then(response => response.json())
+            .then(data => {
+                const datalist = document.getElementById('search-suggestions');
+                if (!datalist || !data.sugerencias) return;
+
+                datalist.innerHTML = '';
+                data.sugerencias.forEach(sugerencia => {
+                    const option = document.createElement('option');
+                    option.value = sugerencia.texto;
+                    datalist.appendChild(option);
                 });
+            })
+            .catch(error => {
+                if (error.name !== 'AbortError') {
+                    console.error('Error en autocompletado:', error);
+                }
             });
-        }
     }
 
     tieneFilters() {
@@ -2,7 +2,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
-from .models import Usuario, Interesado, Reclutador, Secretaria, Categoria, Vacante, RequisitoVacante, Postulacion
+from .models import Usuario, Interesado, Reclutador, Secretaria, Categoria, Vacante, RequisitoVacante, Postulacion, PostulacionEvento, TrabajoPDF, VacanteRecomendada
 
 
 class InteresadoInline(admin.StackedInline):
@@ -122,4 +122,42 @@ class PostulacionAdmin(admin.ModelAdmin):
     list_display = ('interesado', 'vacante', 'estado', 'fecha_postulacion')
     list_filter = ('estado', 'fecha_postulacion', 'vacante__categoria')
     search_fields = ('interesado__nombre', 'interesado__apellido_paterno', 'vacante__titulo')
-    readonly_fields = ('fecha_postulacion', 'fecha_actualizacion')
\ No newline at end of file
+    readonly_fields = ('fecha_postulacion', 'fecha_actualizacion')
+
+
+@admin.register(PostulacionEvento)
+class PostulacionEventoAdmin(admin.ModelAdmin):
+    list_display = ('postulacion', 'vacante', 'estado_anterior', 'estado_nuevo', 'fecha')
+    list_filter = ('estado_nuevo', 'fecha')
+    search_fields = ('vacante__titulo',)
+    list_select_related = ('postulacion__interesado', 'postulacion__vacante', 'vacante')
+    date_hierarchy = 'fecha'
+
+    # Registro de solo inserción
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(TrabajoPDF)
+class TrabajoPDFAdmin(admin.ModelAdmin):
+    list_display = ('interesado', 'version', 'estado', 'intentos', 'fecha_creacion', 'fecha_actualizacion')
+    list_filter = ('estado',)
+    search_fields = ('interesado__nombre', 'interesado__apellido_paterno')
+    readonly_fields = ('fecha_creacion', 'fecha_actualizacion')
+
+
+@admin.register(VacanteRecomendada)
+class VacanteRecomendadaAdmin(admin.ModelAdmin):
+    list_display = ('interesado', 'vacante', 'posicion', 'puntaje', 'fecha_calculo')
+    search_fields = ('interesado__nombre', 'interesado__apellido_paterno', 'vacante__titulo')
+    list_select_related = ('interesado', 'vacante__secretaria')
+
+    # Se generan con `python manage.py generar_recomendaciones`
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,144 @@
+# usuarios/autocompletado.py
+import threading
+import time
+
+from .busqueda import normalizar_texto
+from .cache_busqueda import generacion_busquedas
+from .models import Vacante, Categoria, Secretaria
+
+# Número máximo de sugerencias que guarda cada nodo del trie
+MAX_SUGERENCIAS = 8
+
+# Segundos mínimos entre reconstrucciones, aunque cambie la generación de búsquedas
+INTERVALO_RECONSTRUCCION = 60
+
+# Peso base por tipo: a igual frecuencia se prefieren títulos de vacantes
+PESOS_TIPO = {
+    'vacante': 3,
+    'categoria': 2,
+    'secretaria': 1,
+    'municipio': 1,
+}
+
+
+class _Nodo:
+    __slots__ = ('hijos', 'mejores')
+
+    def __init__(self):
+        self.hijos = {}
+        self.mejores = []
+
+
+class TrieSugerencias:
+    """
+    Trie de prefijos con las mejores sugerencias precalculadas en cada nodo.
+
+    Cada texto se indexa desde el inicio de cada una de sus palabras ("Ingeniero
+    Civil" se encuentra con "ing" y con "civ"), sin acentos ni mayúsculas. Buscar un
+    prefijo solo recorre len(prefijo) nodos y devuelve la lista ya ordenada.
+    """
+
+    def __init__(self, entradas, max_sugerencias=MAX_SUGERENCIAS):
+        """
+        Args:
+            entradas: iterable de (texto, tipo, peso)
+        """
+        self.raiz = _Nodo()
+        self.max_sugerencias = max_sugerencias
+
+        # Acumular peso por texto para no repetir sugerencias (títulos duplicados)
+        acumulado = {}
+        for texto, tipo, peso in entradas:
+            texto = ' '.join(texto.split())
+            if not texto:
+                continue
+            clave = (texto.lower(), tipo)
+            if clave in acumulado:
+                acumulado[clave]['peso'] += peso
+            else:
+                acumulado[clave] = {'texto': texto, 'tipo': tipo, 'peso': peso}
+
+        ordenadas = sorted(acumulado.values(), key=lambda s: (-s['peso'], s['texto']))
+        for sugerencia in ordenadas:
+            self._insertar(sugerencia)
+
+    def _insertar(self, sugerencia):
+        palabras = normalizar_texto(sugerencia['texto']).split()
+        visitados = set()
+        for inicio in range(len(palabras)):
+            nodo = self.raiz
+            for caracter in ' '.join(palabras[inicio:]):
+                nodo = nodo.hijos.setdefault(caracter, _Nodo())
+                # Las sugerencias llegan ordenadas por peso: basta con llenar hasta el máximo
+                if id(nodo) not in visitados and len(nodo.mejores) < self.max_sugerencias:
+                    nodo.mejores.append({'texto': sugerencia['texto'], 'tipo': sugerencia['tipo']})
+                visitados.add(id(nodo))
+
+    def buscar(self, prefijo, limite=MAX_SUGERENCIAS):
+        """Devuelve hasta `limite` sugerencias para el prefijo."""
+        nodo = self.raiz
+        for caracter in ' '.join(normalizar_texto(prefijo).split()):
+            nodo = nodo.hijos.get(caracter)
+            if nodo is None:
+                return []
+        return nodo.mejores[:limite]
+
+
+def _entradas_sugerencias():
+    """Textos a sugerir: títulos publicados, categorías, secretarías activas y municipios."""
+    titulos = Vacante.objects.filter(
+        estado_vacante='publicada',
+        aprobada=True
+    ).values_list('titulo', flat=True)
+    for titulo in titulos.iterator():
+        yield titulo, 'vacante', PESOS_TIPO['vacante']
+
+    for nombre in Categoria.objects.values_list('nombre', flat=True):
+        yield nombre, 'categoria', PESOS_TIPO['categoria']
+
+    for nombre in Secretaria.objects.filter(activa=True).values_list('nombre', flat=True):
+        yield nombre, 'secretaria', PESOS_TIPO['secretaria']
+
+    for _clave, nombre in Vacante.MUNICIPIOS_ESTADO_MEXICO:
+        yield nombre, 'municipio', PESOS_TIPO['municipio']
+
+
+_trie = None
+_generacion = None
+_construido_en = 0.0
+_lock = threading.Lock()
+
+
+def obtener_trie():
+    """
+    Trie del proceso actual, reconstruido cuando cambia la generación de búsquedas
+    (alguna vacante se guardó) y pasó al menos INTERVALO_RECONSTRUCCION segundos.
+
+    Mientras un hilo reconstruye, los demás siguen usando el trie anterior.
+    """
+    global _trie, _generacion, _construido_en
+
+    generacion = generacion_busquedas()
+    if _trie is not None and (
+        generacion == _generacion or time.monotonic() - _construido_en < INTERVALO_RECONSTRUCCION
+    ):
+        return _trie
+
+    # Solo la primera construcción espera el lock; después se sirve el trie anterior
+    if not _lock.acquire(blocking=_trie is None):
+        return _trie
+    try:
+        if _trie is None or generacion != _generacion:
+            _trie = TrieSugerencias(_entradas_sugerencias())
+            _generacion = generacion
+            _construido_en = time.monotonic()
+    finally:
+        _lock.release()
+    return _trie
+
+
+def sugerencias(prefijo, limite=MAX_SUGERENCIAS):
+    """Sugerencias de autocompletado para el cuadro de búsqueda."""
+    if len(prefijo.strip()) < 2:
+        return []
+    return obtener_trie().buscar(prefijo, limite)
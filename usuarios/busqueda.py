@@ -0,0 +1,256 @@
+# usuarios/busqueda.py
+import re
+import unicodedata
+from difflib import SequenceMatcher
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.db import OperationalError, connection, transaction
+from django.db.models import Count, F, FloatField, Func, Q, Value
+from django.db.models.functions import Cast, Lower
+
+from .models import Vacante, RequisitoVacante
+
+# Configuración de texto de PostgreSQL (stemming en español)
+CONFIG_BUSQUEDA = 'spanish'
+
+# Misma expresión que el índice vacante_titulo_trgm_gin (ver Vacante.Meta.indexes)
+TITULO_NORMALIZADO = Func(Lower('titulo'), function='usuarios_unaccent')
+
+# Similitud mínima para considerar que un término se parece al nombre de un municipio
+SIMILITUD_MUNICIPIO = 0.8
+
+# Dimensiones de facetas: parámetro GET -> campo de Vacante
+DIMENSIONES_FACETAS = {
+    'tipo_empleo': 'tipo_empleo',
+    'modalidad': 'modalidad',
+    'municipio': 'municipio',
+    'categoria': 'categoria_id',
+}
+
+# Tiempo máximo (ms) de la consulta de facetas; si se excede la página se muestra sin ellas
+LIMITE_FACETAS_MS = 250
+
+
+def _unir(*textos):
+    """Une los textos no vacíos en una sola cadena."""
+    return ' '.join(texto for texto in textos if texto)
+
+
+def normalizar_texto(texto):
+    """Convierte a minúsculas y elimina acentos ("Nezahualcóyotl" -> "nezahualcoyotl")."""
+    descompuesto = unicodedata.normalize('NFKD', texto.lower())
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c)).strip()
+
+
+# Los 125 municipios son una lista fija: se normalizan una sola vez al importar
+_MUNICIPIOS_NORMALIZADOS = [
+    (clave, normalizar_texto(nombre)) for clave, nombre in Vacante.MUNICIPIOS_ESTADO_MEXICO
+]
+
+
+def municipios_similares(texto):
+    """
+    Devuelve las claves de municipio que coinciden con el texto sin importar acentos
+    ni errores de dedo ("ecatepec" -> ecatepec_de_morelos, "toluka" -> toluca).
+
+    La comparación se hace en memoria contra la lista fija de municipios, así la
+    consulta solo filtra por municipio__in sobre un índice B-tree.
+    """
+    palabras = [p for p in re.findall(r'\w+', normalizar_texto(texto)) if len(p) >= 4]
+    if not palabras:
+        return []
+
+    # Primero coincidencias exactas sin acentos; solo si no hay, se toleran errores
+    claves = [
+        clave for clave, nombre in _MUNICIPIOS_NORMALIZADOS
+        if any(palabra in nombre for palabra in palabras)
+    ]
+    if claves:
+        return claves
+
+    return [
+        clave for clave, nombre in _MUNICIPIOS_NORMALIZADOS
+        if any(
+            SequenceMatcher(None, palabra, parte).ratio() >= SIMILITUD_MUNICIPIO
+            for palabra in palabras for parte in nombre.split()
+        )
+    ]
+
+
+def vector_busqueda(vacante):
+    """
+    Construye la expresión tsvector ponderada de una vacante.
+
+    Pesos: A = título, B = requisitos y categoría, C = descripción,
+    D = secretaría y municipio.
+    """
+    try:
+        requisitos = vacante.requisitos
+    except RequisitoVacante.DoesNotExist:
+        requisitos = None
+
+    texto_requisitos = ''
+    if requisitos:
+        texto_requisitos = _unir(
+            requisitos.descripcion_requisitos,
+            requisitos.educacion_minima,
+            requisitos.experiencia_minima,
+        )
+
+    return (
+        SearchVector(Value(vacante.titulo or ''), weight='A', config=CONFIG_BUSQUEDA) +
+        SearchVector(Value(_unir(texto_requisitos, vacante.categoria.nombre)), weight='B', config=CONFIG_BUSQUEDA) +
+        SearchVector(Value(vacante.descripcion or ''), weight='C', config=CONFIG_BUSQUEDA) +
+        SearchVector(
+            Value(_unir(vacante.secretaria.nombre, vacante.get_municipio_display())),
+            weight='D', config=CONFIG_BUSQUEDA
+        )
+    )
+
+
+def actualizar_vector_busqueda(vacante_ids):
+    """
+    Recalcula el search_vector de las vacantes indicadas.
+
+    Se usa update() para no disparar post_save de nuevo ni tocar fecha_actualizacion.
+    """
+    vacantes = Vacante.objects.filter(id__in=vacante_ids).select_related(
+        'categoria', 'secretaria', 'requisitos'
+    )
+    for vacante in vacantes:
+        Vacante.objects.filter(id=vacante.id).update(search_vector=vector_busqueda(vacante))
+
+
+def consulta_busqueda(termino):
+    """
+    Convierte el texto del usuario en un SearchQuery con coincidencia por prefijo.
+
+    Solo se conservan caracteres de palabra, así el texto nunca rompe la sintaxis de
+    tsquery; cada término usa ':*' para que la búsqueda en vivo encuentre palabras
+    incompletas ("ingen" -> "ingeniero").
+    """
+    terminos = re.findall(r'\w+', termino.lower())
+    if not terminos:
+        return None
+    return SearchQuery(
+        ' & '.join(f'{t}:*' for t in terminos),
+        search_type='raw',
+        config=CONFIG_BUSQUEDA
+    )
+
+
+def buscar_vacantes_texto(queryset, termino):
+    """
+    Filtra el queryset por texto completo y lo ordena por relevancia (ts_rank).
+
+    Además del índice GIN de search_vector, acepta coincidencias aproximadas del
+    título (pg_trgm sobre el título sin acentos) y de municipios escritos sin
+    acentos o con errores, sumando la similitud del título al ranking.
+
+    Las palabras que nombran un municipio se separan del resto: "analista toluka"
+    devuelve las vacantes de Toluca que además coinciden con "analista", no todas
+    las de Toluca.
+    """
+    consulta = consulta_busqueda(termino)
+    if consulta is None:
+        return queryset
+
+    municipios = []
+    resto = []
+    for palabra in re.findall(r'\w+', termino):
+        similares = municipios_similares(palabra)
+        if similares:
+            municipios.extend(similares)
+        else:
+            resto.append(palabra)
+
+    texto = ' '.join(resto) if municipios else termino
+    normalizado = normalizar_texto(texto)
+
+    # Toda la consulta en el índice (incluye el municipio con peso D)
+    filtro = Q(search_vector=consulta)
+    if municipios and resto:
+        # Municipio escrito con errores Y el resto de las palabras en el texto o el título
+        filtro |= Q(municipio__in=municipios) & (
+            Q(search_vector=consulta_busqueda(texto)) |
+            Q(titulo_normalizado__trigram_word_similar=normalizado)
+        )
+    elif municipios:
+        filtro |= Q(municipio__in=municipios)
+    else:
+        filtro |= Q(titulo_normalizado__trigram_word_similar=normalizado)
+
+    return queryset.annotate(
+        titulo_normalizado=TITULO_NORMALIZADO
+    ).filter(filtro).annotate(
+        # float4 en PostgreSQL: se pasa a double para que el valor guardado en el
+        # cursor (JSON) sea exactamente el que compara la siguiente página
+        rank=Cast(
+            SearchRank(F('search_vector'), consulta) + TrigramWordSimilarity(normalizado, 'titulo_normalizado'),
+            FloatField()
+        )
+    ).order_by('-rank', '-fecha_publicacion', '-id')
+
+
+def calcular_facetas(queryset, seleccion, limite_ms=LIMITE_FACETAS_MS):
+    """
+    Cuenta resultados por tipo de empleo, modalidad, municipio y categoría en una sola
+    consulta agrupada.
+
+    El queryset debe traer solo la búsqueda de texto (sin los filtros de facetas). Se
+    agrupa por la combinación de las cuatro dimensiones y los conteos se suman en
+    memoria: cada dimensión respeta los filtros seleccionados en las otras tres pero
+    no el suyo, así el usuario ve cuántos resultados tendría al cambiar de opción.
+
+    Args:
+        queryset: Vacantes publicadas, ya filtradas por texto
+        seleccion: dict {dimension: valor} con los filtros activos
+        limite_ms: statement_timeout para la consulta de facetas
+
+    Returns:
+        dict {dimension: [{'valor', 'etiqueta', 'total', 'seleccionado'}]} o None si
+        la consulta excedió el límite de tiempo.
+    """
+    campos = list(DIMENSIONES_FACETAS.values())
+    try:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL statement_timeout = %s', [int(limite_ms)])
+            filas = list(
+                queryset.order_by().values(*campos, 'categoria__nombre').annotate(total=Count('id'))
+            )
+    except OperationalError:
+        return None
+
+    seleccion = {dim: str(valor) for dim, valor in seleccion.items() if valor and dim in DIMENSIONES_FACETAS}
+    conteos = {dim: {} for dim in DIMENSIONES_FACETAS}
+    nombres_categoria = {}
+    for fila in filas:
+        valores = {dim: str(fila[campo]) for dim, campo in DIMENSIONES_FACETAS.items()}
+        nombres_categoria[valores['categoria']] = fila['categoria__nombre']
+        for dim in DIMENSIONES_FACETAS:
+            if all(valores[otra] == valor for otra, valor in seleccion.items() if otra != dim):
+                conteos[dim][valores[dim]] = conteos[dim].get(valores[dim], 0) + fila['total']
+
+    etiquetas = {
+        'tipo_empleo': dict(Vacante.TIPOS_EMPLEO),
+        'modalidad': dict(Vacante.MODALIDAD),
+        'municipio': dict(Vacante.MUNICIPIOS_ESTADO_MEXICO),
+        'categoria': nombres_categoria,
+    }
+
+    return {
+        dim: sorted(
+            (
+                {
+                    'valor': valor,
+                    'etiqueta': etiquetas[dim].get(valor, valor),
+                    'total': total,
+                    'seleccionado': seleccion.get(dim) == valor,
+                }
+                for valor, total in conteos[dim].items()
+            ),
+            key=lambda faceta: (-faceta['total'], faceta['etiqueta'])
+        )
+        for dim in DIMENSIONES_FACETAS
+    }
@@ -0,0 +1,113 @@
+# usuarios/cache_busqueda.py
+import hashlib
+import json
+import time
+
+from django.core.cache import cache, caches
+
+from .models import Vacante
+from .paginacion import PaginaCursor, PaginadorCursor
+
+# Contador de generación: cambia cada vez que se modifica una vacante. Vive en su
+# propio alias, que no se depura al llenarse como la caché de resultados
+CLAVE_GENERACION = 'busquedas:generacion'
+ALIAS_GENERACION = 'generaciones'
+
+# Relaciones que usan los listados de vacantes al leer una página cacheada
+RELACIONES_LISTADO = ('secretaria', 'reclutador', 'categoria')
+
+# Segundos que se conserva una página de resultados (la invalidación real es la generación)
+TIEMPO_CACHE_BUSQUEDA = 600
+
+
+def generacion_busquedas():
+    """
+    Generación actual de los resultados de búsqueda.
+
+    Se inicia con la hora en nanosegundos, no con 1: si la clave se pierde, la
+    nueva generación nunca coincide con una anterior cuyas páginas sigan en caché.
+    """
+    return caches[ALIAS_GENERACION].get_or_set(CLAVE_GENERACION, time.time_ns, None)
+
+
+def invalidar_busquedas():
+    """
+    Incrementa la generación: todas las claves anteriores dejan de usarse y expiran solas.
+
+    Se llama desde usuarios/signals.py al guardar o eliminar vacantes y sus datos de búsqueda.
+    """
+    generaciones = caches[ALIAS_GENERACION]
+    try:
+        generaciones.incr(CLAVE_GENERACION)
+    except ValueError:
+        # La clave se perdió (caché borrada o backend reiniciado)
+        generaciones.set(CLAVE_GENERACION, time.time_ns(), None)
+
+
+def clave_busqueda(vista, parametros):
+    """
+    Clave de caché para una búsqueda: vista + parámetros normalizados + generación.
+
+    El texto se pasa a minúsculas y se colapsan espacios, así "  Ingeniero " y
+    "ingeniero" comparten resultados.
+    """
+    normalizados = {}
+    for nombre, valor in parametros.items():
+        valor = ' '.join(str(valor or '').split())
+        if nombre == 'q':
+            valor = valor.lower()
+        if valor:
+            normalizados[nombre] = valor
+
+    firma = hashlib.md5(json.dumps(normalizados, sort_keys=True).encode()).hexdigest()
+    return f'busquedas:{generacion_busquedas()}:{vista}:{firma}'
+
+
+def resultado_cacheado(vista, parametros, calcular):
+    """
+    Devuelve el resultado cacheado de calcular() para esta búsqueda.
+
+    Los resultados None (por ejemplo facetas que excedieron su límite de tiempo)
+    no se guardan, para reintentarlos en la siguiente petición.
+    """
+    clave = clave_busqueda(vista, parametros)
+    resultado = cache.get(clave)
+    if resultado is None:
+        resultado = calcular()
+        if resultado is not None:
+            cache.set(clave, resultado, TIEMPO_CACHE_BUSQUEDA)
+    return resultado
+
+
+def contar_cacheado(vista, parametros, queryset):
+    """Total de resultados de la búsqueda, sin repetir COUNT(*) en cada página."""
+    return resultado_cacheado(f'{vista}:total', parametros, queryset.order_by().count)
+
+
+def pagina_cacheada(vista, parametros, queryset, por_pagina, cursor=None):
+    """
+    Página de resultados de PaginadorCursor con los IDs guardados en caché.
+
+    En caché solo viven los IDs y los cursores; en un acierto las vacantes se leen
+    por llave primaria desde Vacante.objects, sin los filtros del queryset: no se
+    vuelve a ejecutar la búsqueda de texto (tsvector, trigramas, unaccent) ni el
+    ordenamiento.
+    """
+    clave = clave_busqueda(vista, dict(parametros, cursor=cursor))
+    datos = cache.get(clave)
+
+    if datos is None:
+        pagina = PaginadorCursor(queryset, por_pagina).get_page(cursor)
+        cache.set(clave, {
+            'ids': [objeto.id for objeto in pagina],
+            'siguiente': pagina.cursor_siguiente,
+            'anterior': pagina.cursor_anterior,
+        }, TIEMPO_CACHE_BUSQUEDA)
+        return pagina
+
+    por_id = Vacante.objects.select_related(*RELACIONES_LISTADO).in_bulk(datos['ids'])
+    return PaginaCursor(
+        [por_id[pk] for pk in datos['ids'] if pk in por_id],
+        cursor_siguiente=datos['siguiente'],
+        cursor_anterior=datos['anterior'],
+    )
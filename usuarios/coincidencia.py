@@ -0,0 +1,253 @@
+# usuarios/coincidencia.py
+import re
+from collections import Counter
+from datetime import date
+
+import numpy as np
+from django.db import transaction
+
+from .busqueda import normalizar_texto
+from .models import Postulacion, RequisitoVacante
+
+# Peso de cada componente en el puntaje final (suman 1)
+PESOS_COINCIDENCIA = np.array([
+    0.45,  # habilidades del CV que cubren los términos de la vacante, ponderadas por nivel
+    0.25,  # similitud (coseno) entre el texto del CV y el de la vacante
+    0.20,  # años de experiencia contra la experiencia mínima
+    0.10,  # nivel de estudios contra la educación mínima
+])
+
+# Peso de una habilidad según su nivel
+PESO_NIVEL = {
+    'basico': 0.4,
+    'intermedio': 0.6,
+    'avanzado': 0.8,
+    'experto': 1.0,
+}
+
+# Términos principales de una vacante: cubrirlos todos da el puntaje máximo de habilidades
+TERMINOS_CLAVE = 10
+
+# Niveles de estudio, de menor a mayor, con las palabras que los identifican
+NIVELES_ESTUDIO = [
+    ('secundaria',),
+    ('preparatoria', 'bachillerato'),
+    ('tecnico', 'tecnica', 'tsu'),
+    ('licenciatura', 'ingenieria', 'ingeniero', 'licenciado', 'profesional'),
+    ('maestria', 'especialidad', 'posgrado', 'mba'),
+    ('doctorado',),
+]
+
+# Palabras que no aportan a la coincidencia
+PALABRAS_VACIAS = {
+    'de', 'la', 'que', 'el', 'en', 'y', 'los', 'del', 'las', 'por', 'un', 'para', 'con', 'una',
+    'su', 'al', 'lo', 'como', 'mas', 'o', 'se', 'sus', 'es', 'son', 'sin', 'sobre', 'entre',
+    'a', 'e', 'u', 'no', 'si', 'nos', 'les', 'este', 'esta', 'estos', 'estas', 'muy', 'ya',
+    'the', 'and', 'of', 'to', 'in', 'for', 'with',
+}
+
+# Palabras con letras, números y los símbolos de nombres como c++, c#, node.js
+_PATRON_TERMINO = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+_PATRON_NUMERO = re.compile(r'\d+')
+
+
+def terminos(texto):
+    """Términos normalizados (sin acentos ni palabras vacías) de un texto."""
+    resultado = []
+    for termino in _PATRON_TERMINO.findall(normalizar_texto(texto or '')):
+        termino = termino.rstrip('.')
+        if len(termino) >= 2 and termino not in PALABRAS_VACIAS and not termino.isdigit():
+            resultado.append(termino)
+    return resultado
+
+
+def nivel_estudio(texto):
+    """Índice en NIVELES_ESTUDIO (1 = secundaria ... 6 = doctorado) o 0 si no se reconoce."""
+    palabras = set(terminos(texto))
+    nivel = 0
+    for indice, claves in enumerate(NIVELES_ESTUDIO, start=1):
+        if palabras.intersection(claves):
+            nivel = indice
+    return nivel
+
+
+def _anios(texto):
+    """Primer número del texto ("2 años de experiencia" -> 2) o 0."""
+    numero = _PATRON_NUMERO.search(texto or '')
+    return int(numero.group()) if numero else 0
+
+
+def _anios_experiencia(experiencias, hoy):
+    """Años de experiencia sumando los periodos de la instantánea del CV."""
+    dias = 0
+    for experiencia in experiencias:
+        try:
+            inicio = date.fromisoformat(experiencia['fecha_inicio'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        fin = hoy
+        if not experiencia.get('actual') and experiencia.get('fecha_fin'):
+            fin = date.fromisoformat(experiencia['fecha_fin'])
+        dias += max((fin - inicio).days, 0)
+    return dias / 365.25
+
+
+def _requisitos(vacante):
+    try:
+        return vacante.requisitos
+    except RequisitoVacante.DoesNotExist:
+        return None
+
+
+def terminos_vacante(vacante):
+    """
+    Frecuencia de cada término de una vacante (Counter), contando doble el
+    título y la descripción de requisitos.
+    """
+    requisitos = _requisitos(vacante)
+    partes = [
+        (vacante.titulo, 2),
+        (vacante.descripcion, 1),
+        (vacante.categoria.nombre, 1),
+    ]
+    if requisitos:
+        partes += [
+            (requisitos.descripcion_requisitos, 2),
+            (requisitos.educacion_minima, 1),
+            (requisitos.experiencia_minima, 1),
+        ]
+
+    frecuencias = Counter()
+    for texto, peso in partes:
+        for termino in terminos(texto):
+            frecuencias[termino] += peso
+    return frecuencias
+
+
+class PerfilVacante:
+    """
+    Lo que pide una vacante, preparado una sola vez para puntuar a todos sus postulantes.
+
+    El vocabulario son los términos del título, descripción, requisitos y
+    categoría; `pesos` es el vector de la vacante sobre ese vocabulario (log de
+    la frecuencia de terminos_vacante).
+    """
+
+    def __init__(self, vacante):
+        requisitos = _requisitos(vacante)
+        frecuencias = terminos_vacante(vacante)
+
+        self.vocabulario = {termino: indice for indice, termino in enumerate(frecuencias)}
+        self.pesos = np.log1p(np.fromiter(frecuencias.values(), dtype=np.float64, count=len(frecuencias)))
+        self.norma = float(np.linalg.norm(self.pesos)) or 1.0
+        # Peso de los TERMINOS_CLAVE términos más importantes
+        self.peso_clave = float(np.sort(self.pesos)[-TERMINOS_CLAVE:].sum()) or 1.0
+
+        self.anios_minimos = _anios(requisitos.experiencia_minima) if requisitos else 0
+        self.estudio_minimo = nivel_estudio(requisitos.educacion_minima) if requisitos else 0
+
+    def puntuar(self, instantaneas, hoy=None):
+        """
+        Puntaje (0-100) de cada instantánea de CV, en el mismo orden.
+
+        Las habilidades y el texto de cada CV se vuelven vectores dispersos sobre
+        el vocabulario de la vacante (listas de coordenadas fila/columna/valor) y
+        se puntúan todos a la vez con productos de matrices.
+        """
+        hoy = hoy or date.today()
+        total = len(instantaneas)
+        columnas = len(self.vocabulario)
+        if not total:
+            return np.zeros(0)
+
+        filas_hab, columnas_hab, valores_hab = [], [], []
+        filas_txt, columnas_txt = [], []
+        normas_txt = np.zeros(total)
+        componentes = np.zeros((total, len(PESOS_COINCIDENCIA)))
+
+        for fila, instantanea in enumerate(instantaneas):
+            # Habilidades: cada término del nombre que aparece en la vacante, con el peso del nivel
+            for habilidad in instantanea.get('habilidades', []):
+                peso = PESO_NIVEL.get(habilidad.get('nivel'), 0.5)
+                for termino in terminos(habilidad.get('nombre')):
+                    columna = self.vocabulario.get(termino)
+                    if columna is not None:
+                        filas_hab.append(fila)
+                        columnas_hab.append(columna)
+                        valores_hab.append(peso)
+
+            # Texto libre del CV: resumen, puestos, descripciones y estudios
+            textos = [instantanea.get('resumen_profesional', '')]
+            for experiencia in instantanea.get('experiencias', []):
+                textos += [experiencia.get('puesto'), experiencia.get('descripcion')]
+            for educacion in instantanea.get('educaciones', []):
+                textos += [educacion.get('titulo'), educacion.get('descripcion')]
+            frecuencias = Counter(terminos(' '.join(texto for texto in textos if texto)))
+            # La norma usa todos los términos del CV, no solo los del vocabulario
+            normas_txt[fila] = np.linalg.norm(np.log1p(np.fromiter(frecuencias.values(), dtype=np.float64)))
+            for termino, frecuencia in frecuencias.items():
+                columna = self.vocabulario.get(termino)
+                if columna is not None:
+                    filas_txt.extend([fila] * frecuencia)
+                    columnas_txt.extend([columna] * frecuencia)
+
+            # Experiencia y estudios
+            anios = _anios_experiencia(instantanea.get('experiencias', []), hoy)
+            if self.anios_minimos:
+                componentes[fila, 2] = min(anios / self.anios_minimos, 1.0)
+            else:
+                componentes[fila, 2] = 1.0 if anios > 0 else 0.5
+
+            estudio = max(
+                (nivel_estudio(educacion.get('titulo')) for educacion in instantanea.get('educaciones', [])),
+                default=0
+            )
+            if self.estudio_minimo:
+                componentes[fila, 3] = min(estudio / self.estudio_minimo, 1.0)
+            else:
+                componentes[fila, 3] = 1.0
+
+        # Matrices postulantes x vocabulario armadas desde las coordenadas
+        habilidades = np.zeros((total, columnas))
+        np.maximum.at(habilidades, (filas_hab, columnas_hab), valores_hab)
+        texto = np.zeros((total, columnas))
+        np.add.at(texto, (filas_txt, columnas_txt), 1.0)
+        texto = np.log1p(texto)
+
+        componentes[:, 0] = np.minimum(habilidades @ self.pesos / self.peso_clave, 1.0)
+        normas_txt[normas_txt == 0] = 1.0
+        componentes[:, 1] = (texto @ self.pesos) / (normas_txt * self.norma)
+
+        return np.round(componentes @ PESOS_COINCIDENCIA * 100, 1)
+
+
+def calcular_puntajes(vacante, solo_pendientes=True):
+    """
+    Calcula y guarda Postulacion.puntaje_coincidencia de los postulantes de una vacante.
+
+    Una consulta trae las instantáneas de CV, un solo paso de NumPy las puntúa
+    y un bulk_update guarda los resultados. Con `solo_pendientes` solo se
+    puntúan las postulaciones sin puntaje (nuevas o invalidadas al editar la
+    vacante en usuarios/signals.py).
+
+    Se llama también desde la lista de postulantes (GET): las filas se bloquean
+    con SKIP LOCKED, así dos peticiones simultáneas no puntúan ni escriben las
+    mismas postulaciones, y la invalidación de usuarios/signals.py espera a que
+    termine la escritura en lugar de quedar sobrescrita.
+
+    Returns:
+        Número de postulaciones puntuadas.
+    """
+    with transaction.atomic():
+        postulaciones = Postulacion.objects.filter(vacante=vacante)
+        if solo_pendientes:
+            postulaciones = postulaciones.filter(puntaje_coincidencia__isnull=True)
+        postulaciones = list(postulaciones.select_for_update(skip_locked=True).only('id', 'cv_instantanea'))
+        if not postulaciones:
+            return 0
+
+        puntajes = PerfilVacante(vacante).puntuar([postulacion.cv_instantanea for postulacion in postulaciones])
+        for postulacion, puntaje in zip(postulaciones, puntajes):
+            postulacion.puntaje_coincidencia = float(puntaje)
+        Postulacion.objects.bulk_update(postulaciones, ['puntaje_coincidencia'], batch_size=500)
+    return len(postulaciones)
@@ -0,0 +1,125 @@
+# usuarios/estadisticas.py
+from collections import Counter
+
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import Vacante, Postulacion
+
+
+def _agregados_contadores():
+    """Count condicional de cada contador de Vacante, para un annotate() sobre vacantes."""
+    agregados = {'num_postulaciones': Count('postulaciones')}
+    for estado, campo in Vacante.CONTADORES_ESTADO.items():
+        agregados[campo] = Count('postulaciones', filter=Q(postulaciones__estado=estado))
+    return agregados
+
+
+# Clave en el contexto / JSON de ver_postulantes.html -> atributo de la vacante
+CLAVES_ESTADISTICAS = {
+    'total_postulantes': 'num_postulaciones',
+    'nuevos_hoy': 'nuevos_hoy',
+    'enviadas': 'num_enviadas',
+    'en_revision': 'num_en_revision',
+    'preseleccionados': 'num_preseleccionados',
+    'entrevista': 'num_entrevista',
+    'aceptados': 'num_aceptadas',
+    'rechazados': 'num_rechazadas',
+}
+
+
+def _subconsulta_conteo(estado=None, **filtros):
+    """COUNT(*) correlacionado de las postulaciones de la vacante (opcionalmente de un estado)."""
+    postulaciones = Postulacion.objects.filter(vacante=OuterRef('pk'), **filtros)
+    if estado:
+        postulaciones = postulaciones.filter(estado=estado)
+    conteo = postulaciones.order_by().values('vacante').annotate(total=Count('id')).values('total')
+    return Coalesce(Subquery(conteo, output_field=IntegerField()), 0)
+
+
+def anotar_nuevos_hoy(vacantes):
+    """
+    Agrega `nuevos_hoy` (postulaciones recibidas hoy) a un queryset de vacantes.
+
+    Se filtra por rango desde la medianoche local, no con __date, para que la
+    subconsulta use el índice (vacante, fecha_postulacion).
+    """
+    inicio_hoy = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    return vacantes.annotate(nuevos_hoy=_subconsulta_conteo(fecha_postulacion__gte=inicio_hoy))
+
+
+def estadisticas_de(vacante):
+    """Estadísticas de una vacante obtenida con anotar_nuevos_hoy(); no hace consultas."""
+    return {clave: getattr(vacante, campo) for clave, campo in CLAVES_ESTADISTICAS.items()}
+
+
+def estadisticas_vacante(vacante_id):
+    """
+    Estadísticas de postulaciones de una vacante en una sola consulta.
+
+    Los totales salen de los contadores que mantiene usuarios/signals.py y los
+    nuevos de hoy de una subconsulta (ver anotar_nuevos_hoy).
+
+    Returns:
+        dict con las claves de CLAVES_ESTADISTICAS, o None si la vacante no existe.
+    """
+    fila = anotar_nuevos_hoy(
+        Vacante.objects.filter(id=vacante_id)
+    ).values(*CLAVES_ESTADISTICAS.values()).first()
+    if fila is None:
+        return None
+    return {clave: fila[campo] for clave, campo in CLAVES_ESTADISTICAS.items()}
+
+
+def ajustar_contadores_estado(vacante_id, anteriores, nuevo_estado):
+    """
+    Ajusta los contadores por estado de una vacante tras un cambio de estado masivo.
+
+    bulk_update() no dispara post_save, así que aquí se hace en un solo UPDATE
+    lo que usuarios/signals.py haría por cada postulación. Debe llamarse en la
+    misma transacción que el bulk_update.
+
+    Args:
+        anteriores: dict {estado anterior: postulaciones que salieron de él}
+        nuevo_estado: estado al que pasaron todas
+    """
+    contadores = Vacante.CONTADORES_ESTADO
+    deltas = Counter()
+    for estado, cantidad in anteriores.items():
+        if estado != nuevo_estado:
+            deltas[contadores[estado]] -= cantidad
+            deltas[contadores[nuevo_estado]] += cantidad
+
+    # Nunca por debajo de cero aunque el contador se haya desfasado
+    cambios = {campo: Greatest(F(campo) + delta, 0) for campo, delta in deltas.items() if delta}
+    if cambios:
+        Vacante.objects.filter(id=vacante_id).update(**cambios)
+
+
+def recalcular_contadores(vacantes=None):
+    """
+    Reconstruye los contadores de postulaciones a partir de la tabla Postulacion.
+
+    Una consulta agregada encuentra las vacantes desfasadas y un solo UPDATE con
+    subconsultas las corrige.
+
+    Returns:
+        Número de vacantes cuyos contadores estaban desfasados.
+    """
+    vacantes = Vacante.objects.all() if vacantes is None else vacantes
+    agregados = _agregados_contadores()
+    reales = {f'real_{campo}': agregado for campo, agregado in agregados.items()}
+
+    desfasadas = []
+    filas = vacantes.order_by().annotate(**reales).values('id', *agregados, *reales)
+    for fila in filas.iterator():
+        if any(fila[campo] != fila[f'real_{campo}'] for campo in agregados):
+            desfasadas.append(fila['id'])
+
+    if desfasadas:
+        cambios = {'num_postulaciones': _subconsulta_conteo()}
+        for estado, campo in Vacante.CONTADORES_ESTADO.items():
+            cambios[campo] = _subconsulta_conteo(estado)
+        Vacante.objects.filter(id__in=desfasadas).update(**cambios)
+    return len(desfasadas)
@@ -0,0 +1,295 @@
+# usuarios/imagenes.py
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from PIL import Image, ImageOps
+
+from .models import Interesado, Secretaria
+from .storage import almacenamiento_contenido, es_nombre_contenido
+
+logger = logging.getLogger(__name__)
+
+# Carpeta de las versiones reducidas de las fotos de perfil
+CARPETA_DERIVADOS = 'interesados/derivados'
+
+# Lado (px) de cada versión cuadrada de la foto de perfil
+TAMANOS_FOTO = {
+    'completa': 800,
+    'tarjeta': 320,   # encabezados de perfil (120-160 px en pantalla, pantallas 2x)
+    'avatar': 96,     # listas de postulantes (40 px en pantalla, pantallas 2x)
+}
+
+# Formato de cada derivado: WebP para navegadores modernos y JPEG como respaldo
+FORMATOS_FOTO = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpg': ('JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+}
+
+# Formatos aceptados para la foto de perfil
+FORMATOS_ENTRADA = {'JPEG', 'PNG', 'WEBP'}
+
+# Límite de píxeles de la foto original (protección contra "bombas de descompresión":
+# archivos pequeños que al decodificarse ocupan gigabytes). 40 MP cubre cualquier
+# cámara de teléfono; decodificada en RGB ocupa como máximo ~120 MB y, gracias a
+# draft(), una JPEG de ese tamaño se decodifica a 1/2 o 1/4 de resolución.
+MAX_PIXELES_FOTO = 40_000_000
+
+# Lado máximo (px) al recomprimir originales subidos antes de optimizar (optimizar_medios)
+MAX_LADO_ORIGINAL = 1600
+
+# Pillow libera el GIL al decodificar, redimensionar y codificar: dos hilos bastan
+_ejecutor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='fotos-perfil')
+
+
+class ImagenNoValida(ValueError):
+    """La imagen subida no se puede usar como foto de perfil."""
+
+
+def abrir_imagen(archivo):
+    """
+    Abre una imagen leyendo solo su encabezado y valida formato y dimensiones.
+
+    Los píxeles no se decodifican aquí: Pillow los carga hasta que se usan, lo
+    que permite aplicar draft() antes (ver generar_derivados).
+    """
+    try:
+        imagen = Image.open(archivo)
+    except (Image.DecompressionBombError, OSError) as e:
+        raise ImagenNoValida('El archivo no es una imagen válida') from e
+
+    if imagen.format not in FORMATOS_ENTRADA:
+        raise ImagenNoValida('Formato no permitido. Usa JPG, PNG o WebP')
+    if imagen.width * imagen.height > MAX_PIXELES_FOTO:
+        raise ImagenNoValida('La imagen tiene demasiada resolución')
+    return imagen
+
+
+def validar_imagen(archivo):
+    """
+    Verifica una imagen subida sin decodificarla y deja el archivo al inicio.
+
+    Raises:
+        ImagenNoValida
+    """
+    try:
+        abrir_imagen(archivo).verify()
+    except ImagenNoValida:
+        raise
+    except Exception as e:
+        raise ImagenNoValida('El archivo no es una imagen válida') from e
+    finally:
+        archivo.seek(0)
+
+
+def rutas_derivados(derivados):
+    """Nombres en el storage de todos los archivos de un dict foto_derivados."""
+    rutas = set()
+    for derivado in (derivados or {}).values():
+        for extension in FORMATOS_FOTO:
+            if derivado.get(extension):
+                rutas.add(derivado[extension])
+    return rutas
+
+
+def generar_derivados(imagen):
+    """
+    Genera y guarda las versiones reducidas de una imagen abierta con abrir_imagen().
+
+    Memoria: las JPEG se decodifican con draft() directamente a la escala 1/2,
+    1/4 o 1/8 más pequeña que aún cubre el tamaño mayor, así una foto de 12 MP
+    ocupa ~9 MB en lugar de ~36 MB. Otros formatos se decodifican completos
+    (acotados por MAX_PIXELES_FOTO) y se reducen con reduce() antes de LANCZOS.
+    Se procesan de la más grande a la más pequeña, cada una a partir de la
+    anterior, así solo la primera reducción trabaja sobre la imagen original.
+    Los archivos se nombran por su contenido (ver usuarios/storage.py).
+
+    Returns:
+        dict {tamano: {'ancho': px, 'webp': nombre, 'jpg': nombre}}
+    """
+    objetivo = max(TAMANOS_FOTO.values())
+    if imagen.format == 'JPEG':
+        imagen.draft('RGB', (objetivo, objetivo))
+
+    # Reducción entera (barata) dejando al menos el doble del objetivo para LANCZOS
+    factor = min(imagen.size) // (2 * objetivo)
+    if factor >= 2:
+        imagen = imagen.reduce(factor)
+
+    imagen = ImageOps.exif_transpose(imagen)
+    if imagen.mode != 'RGB':
+        imagen = imagen.convert('RGB')
+
+    lado = min(imagen.size)
+    almacenamiento = almacenamiento_contenido()
+    derivados = {}
+    por_ancho = {}
+    origen = imagen
+    for tamano, ancho in sorted(TAMANOS_FOTO.items(), key=lambda item: -item[1]):
+        # No se amplían fotos más pequeñas que el tamaño pedido
+        ancho = min(ancho, lado)
+        if ancho in por_ancho:
+            derivados[tamano] = por_ancho[ancho]
+            continue
+
+        origen = ImageOps.fit(origen, (ancho, ancho), Image.Resampling.LANCZOS)
+        derivado = {'ancho': ancho}
+        for extension, (formato, opciones) in FORMATOS_FOTO.items():
+            salida = BytesIO()
+            origen.save(salida, format=formato, **opciones)
+            nombre = f'{CARPETA_DERIVADOS}/{tamano}.{extension}'
+            derivado[extension] = almacenamiento.save(nombre, ContentFile(salida.getvalue()))
+        derivados[tamano] = por_ancho[ancho] = derivado
+    return derivados
+
+
+def procesar_foto_perfil(interesado_id, nombre_original):
+    """
+    Genera los derivados de la foto de perfil en segundo plano.
+
+    Si el interesado cambió de foto mientras tanto, el resultado no se registra
+    (los archivos huérfanos los elimina `python manage.py limpiar_medios`).
+    """
+    try:
+        with almacenamiento_contenido().open(nombre_original, 'rb') as archivo:
+            derivados = generar_derivados(abrir_imagen(archivo))
+
+        Interesado.objects.filter(
+            id=interesado_id,
+            foto_perfil=nombre_original
+        ).update(foto_derivados=derivados)
+    except Exception:
+        logger.exception('Error al generar derivados de la foto %s', nombre_original)
+    finally:
+        # Cada hilo abre su propia conexión a la base de datos
+        connections.close_all()
+
+
+def programar_derivados(interesado):
+    """Encola la generación de derivados cuando se confirme la transacción actual."""
+    interesado_id = interesado.id
+    nombre_original = interesado.foto_perfil.name
+    transaction.on_commit(lambda: _ejecutor.submit(procesar_foto_perfil, interesado_id, nombre_original))
+
+
+def guardar_foto_perfil(interesado, archivo, nombre):
+    """
+    Guarda la foto original tal como llegó y programa sus derivados.
+
+    La petición solo escribe el archivo; decodificar y redimensionar ocurre en
+    segundo plano. Mientras tanto las plantillas muestran la original. Si la
+    misma imagen ya la subió alguien más (mismo hash), se reutilizan sus
+    derivados. La foto anterior no se borra: otro registro puede compartirla.
+    """
+    interesado.foto_perfil.save(nombre, archivo, save=False)
+    interesado.foto_derivados = Interesado.objects.filter(
+        foto_perfil=interesado.foto_perfil.name
+    ).exclude(
+        foto_derivados={}
+    ).values_list('foto_derivados', flat=True).first() or {}
+    interesado.save(update_fields=['foto_perfil', 'foto_derivados'])
+
+    if not interesado.foto_derivados:
+        programar_derivados(interesado)
+
+
+# ==============================
+# OPTIMIZACIÓN DE ARCHIVOS EXISTENTES
+# ==============================
+
+def recomprimir(imagen, conservar_transparencia=False):
+    """
+    Versión recomprimida de una imagen abierta con abrir_imagen(), como (bytes, extensión).
+
+    Limita el lado mayor a MAX_LADO_ORIGINAL y aplica la orientación EXIF. Las
+    imágenes con transparencia (logos) se mantienen en PNG optimizado; lo demás
+    se guarda como JPEG progresivo.
+    """
+    if imagen.format == 'JPEG':
+        imagen.draft('RGB', (MAX_LADO_ORIGINAL, MAX_LADO_ORIGINAL))
+    imagen = ImageOps.exif_transpose(imagen)
+    imagen.thumbnail((MAX_LADO_ORIGINAL, MAX_LADO_ORIGINAL), Image.Resampling.LANCZOS)
+
+    salida = BytesIO()
+    if conservar_transparencia and imagen.mode in ('RGBA', 'LA', 'P'):
+        imagen.save(salida, format='PNG', optimize=True)
+        return salida.getvalue(), '.png'
+
+    if imagen.mode != 'RGB':
+        imagen = imagen.convert('RGB')
+    imagen.save(salida, format='JPEG', quality=85, optimize=True, progressive=True)
+    return salida.getvalue(), '.jpg'
+
+
+def _optimizar_original(nombre, carpeta, conservar_transparencia=False):
+    """
+    Pasa un archivo anterior al storage por contenido, recomprimido si así pesa menos.
+
+    Returns:
+        (nombre nuevo, bytes antes, bytes después)
+    """
+    almacenamiento = almacenamiento_contenido()
+    antes = almacenamiento.size(nombre)
+    if es_nombre_contenido(nombre):
+        return nombre, antes, antes
+
+    with almacenamiento.open(nombre, 'rb') as archivo:
+        contenido, extension = recomprimir(abrir_imagen(archivo), conservar_transparencia)
+        if len(contenido) < antes:
+            nuevo = almacenamiento.save(f'{carpeta}/original{extension}', ContentFile(contenido))
+            return nuevo, antes, len(contenido)
+
+        # Ya estaba bien comprimido: solo se renombra por su contenido
+        archivo.seek(0)
+        nuevo = almacenamiento.save(f'{carpeta}/original{os.path.splitext(nombre)[1]}', archivo)
+        return nuevo, antes, antes
+
+
+def optimizar_foto_interesado(interesado_id, forzar=False):
+    """
+    Recomprime la foto original de un interesado y genera sus derivados.
+
+    Idempotente: una foto ya nombrada por contenido y con derivados no se toca
+    (salvo con `forzar`). Se ejecuta en un proceso del pool de optimizar_medios.
+
+    Returns:
+        (bytes antes, bytes después, mensaje de error o None)
+    """
+    try:
+        interesado = Interesado.objects.get(id=interesado_id)
+        nombre = interesado.foto_perfil.name
+        if not nombre:
+            return 0, 0, None
+
+        nuevo, antes, despues = _optimizar_original(nombre, 'interesados')
+        derivados = interesado.foto_derivados
+        if forzar or not derivados or nuevo != nombre:
+            with almacenamiento_contenido().open(nuevo, 'rb') as archivo:
+                derivados = generar_derivados(abrir_imagen(archivo))
+
+        # Si el interesado subió otra foto mientras tanto, se respeta la nueva
+        Interesado.objects.filter(id=interesado_id, foto_perfil=nombre).update(
+            foto_perfil=nuevo,
+            foto_derivados=derivados
+        )
+        return antes, despues, None
+    except Exception as e:
+        return 0, 0, f'Interesado {interesado_id}: {e}'
+
+
+def optimizar_logo_secretaria(secretaria_id):
+    """Recomprime el logo de una secretaría conservando su transparencia (los logos no tienen derivados)."""
+    try:
+        secretaria = Secretaria.objects.get(id=secretaria_id)
+        nombre = secretaria.logo.name
+        if not nombre:
+            return 0, 0, None
+
+        nuevo, antes, despues = _optimizar_original(nombre, 'secretarias', conservar_transparencia=True)
+        Secretaria.objects.filter(id=secretaria_id, logo=nombre).update(logo=nuevo)
+        return antes, despues, None
+    except Exception as e:
+        return 0, 0, f'Secretaría {secretaria_id}: {e}'
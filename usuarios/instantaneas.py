@@ -0,0 +1,110 @@
+# usuarios/instantaneas.py
+from django.utils import timezone
+
+from .models import HabilidadInteresado
+
+# Cambia si se modifica la estructura de la instantánea
+VERSION_INSTANTANEA = 1
+
+# Las habilidades se guardan de mayor a menor nivel (la lista de postulantes muestra las primeras)
+_ORDEN_NIVEL = {nivel: orden for orden, (nivel, _) in enumerate(HabilidadInteresado.NIVELES)}
+
+
+def _fecha(valor):
+    return valor.isoformat() if valor else None
+
+
+def instantanea_cv(interesado, curriculum):
+    """
+    Copia compacta y desnormalizada del CV para guardar en Postulacion.cv_instantanea.
+
+    Congela lo que el candidato envió: los cambios posteriores a su CV no alteran
+    lo que el reclutador ve de esa postulación, y las páginas del reclutador la
+    muestran sin consultar experiencias, educación, habilidades ni idiomas. Los
+    textos que dependen de choices o propiedades (niveles, periodos) se guardan
+    ya formateados.
+    """
+    habilidades = sorted(
+        curriculum.habilidades.select_related('habilidad'),
+        key=lambda h: (-_ORDEN_NIVEL.get(h.nivel, 0), h.habilidad.nombre)
+    )
+    return {
+        'version': VERSION_INSTANTANEA,
+        'fecha': timezone.now().isoformat(),
+        'resumen_profesional': curriculum.resumen_profesional or '',
+        'municipio': interesado.get_municipio_display() if interesado.municipio else '',
+        'experiencias': [
+            {
+                'puesto': experiencia.puesto,
+                'empresa': experiencia.empresa,
+                'descripcion': experiencia.descripcion,
+                'periodo': experiencia.periodo_trabajo,
+                'fecha_inicio': _fecha(experiencia.fecha_inicio),
+                'fecha_fin': _fecha(experiencia.fecha_fin),
+                'actual': experiencia.actual,
+            }
+            for experiencia in curriculum.experiencias.order_by('-fecha_inicio')
+        ],
+        'educaciones': [
+            {
+                'titulo': educacion.titulo,
+                'institucion': educacion.institucion,
+                'descripcion': educacion.descripcion or '',
+                'periodo': educacion.periodo_estudio,
+            }
+            for educacion in curriculum.educaciones.order_by('-fecha_inicio')
+        ],
+        'habilidades': [
+            {
+                'id': habilidad.habilidad_id,
+                'nombre': habilidad.habilidad.nombre,
+                'nivel': habilidad.nivel,
+                'nivel_display': habilidad.get_nivel_display(),
+            }
+            for habilidad in habilidades
+        ],
+        'idiomas': [
+            {
+                'idioma': idioma.idioma,
+                'lectura': idioma.get_nivel_lectura_display(),
+                'escritura': idioma.get_nivel_escritura_display(),
+                'conversacion': idioma.get_nivel_conversacion_display(),
+            }
+            for idioma in curriculum.idiomas.all()
+        ],
+    }
+
+
+def contexto_instantanea(instantanea):
+    """
+    Adapta una instantánea a los nombres que usan las plantillas de CV
+    (perfil_candidato_reclutador.html), para renderizarlas sin tocar las tablas del CV.
+    """
+    return {
+        'curriculum': {'resumen_profesional': instantanea.get('resumen_profesional')},
+        'experiencias': [
+            dict(experiencia, periodo_trabajo=experiencia['periodo'])
+            for experiencia in instantanea.get('experiencias', [])
+        ],
+        'educaciones': [
+            dict(educacion, periodo_estudio=educacion['periodo'])
+            for educacion in instantanea.get('educaciones', [])
+        ],
+        'habilidades': [
+            {
+                'habilidad': {'id': habilidad['id'], 'nombre': habilidad['nombre']},
+                'nivel': habilidad['nivel'],
+                'get_nivel_display': habilidad['nivel_display'],
+            }
+            for habilidad in instantanea.get('habilidades', [])
+        ],
+        'idiomas': [
+            {
+                'idioma': idioma['idioma'],
+                'get_nivel_lectura_display': idioma['lectura'],
+                'get_nivel_escritura_display': idioma['escritura'],
+                'get_nivel_conversacion_display': idioma['conversacion'],
+            }
+            for idioma in instantanea.get('idiomas', [])
+        ],
+    }
@@ -0,0 +1,76 @@
+# usuarios/management/commands/benchmark_pdf.py
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.template.loader import render_to_string
+from weasyprint import CSS, HTML
+from weasyprint.text.fonts import FontConfiguration
+
+from usuarios.models import Interesado
+from usuarios.pdf import HOJAS_ESTILO_CV, RenderizadorPDF, contexto_cv
+
+
+class Command(BaseCommand):
+    help = 'Compara el tiempo por CV al renderizar con WeasyPrint desde cero contra RenderizadorPDF'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interesado', type=int,
+            help='ID del interesado cuyo CV se renderiza (por defecto el primero con CV)'
+        )
+        parser.add_argument(
+            '--repeticiones', type=int, default=10,
+            help='Número de renders por modo'
+        )
+
+    def handle(self, *args, **options):
+        interesados = Interesado.objects.select_related('usuario', 'curriculum').filter(curriculum__isnull=False)
+        if options['interesado']:
+            interesados = interesados.filter(id=options['interesado'])
+        interesado = interesados.first()
+        if interesado is None:
+            raise CommandError('No hay un interesado con CV para el benchmark.')
+
+        repeticiones = max(1, options['repeticiones'])
+        html_string = render_to_string(
+            'usuarios/cv_pdf_template.html',
+            contexto_cv(interesado, interesado.curriculum)
+        )
+
+        def sin_servicio():
+            # Lo que hacía cada petición antes: fuentes y hojas de estilo desde cero
+            font_config = FontConfiguration()
+            hojas = [
+                CSS(filename=RenderizadorPDF._ruta_estatico(nombre), font_config=font_config)
+                for nombre in HOJAS_ESTILO_CV
+            ]
+            return HTML(string=html_string).write_pdf(stylesheets=hojas, font_config=font_config)
+
+        inicio = time.perf_counter()
+        renderizador = RenderizadorPDF()
+        preparacion = (time.perf_counter() - inicio) * 1000
+
+        def con_servicio():
+            return renderizador.renderizar(html_string)
+
+        # Un render de calentamiento por modo (importaciones, cachés de Python)
+        sin_servicio()
+        con_servicio()
+
+        resultados = {}
+        for nombre, funcion in (('Sin servicio', sin_servicio), ('RenderizadorPDF', con_servicio)):
+            tiempos = []
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                funcion()
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+            resultados[nombre] = tiempos
+            self.stdout.write(
+                f'{nombre}: media {statistics.mean(tiempos):.1f} ms, '
+                f'mediana {statistics.median(tiempos):.1f} ms ({repeticiones} renders)'
+            )
+
+        ahorro = statistics.mean(resultados['Sin servicio']) - statistics.mean(resultados['RenderizadorPDF'])
+        self.stdout.write(f'Preparación única de RenderizadorPDF: {preparacion:.1f} ms')
+        self.stdout.write(self.style.SUCCESS(f'Ahorro por render: {ahorro:.1f} ms'))
@@ -0,0 +1,42 @@
+# usuarios/management/commands/calcular_coincidencias.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from usuarios.coincidencia import calcular_puntajes
+from usuarios.models import Vacante
+
+
+class Command(BaseCommand):
+    help = ('Calcula el puntaje de coincidencia (Postulacion.puntaje_coincidencia) de los postulantes '
+            'de cada vacante')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--vacante', type=int, action='append',
+            help='ID de vacante a puntuar (se puede repetir; por defecto todas)'
+        )
+        parser.add_argument(
+            '--todas', action='store_true',
+            help='Recalcula también las postulaciones que ya tienen puntaje'
+        )
+
+    def handle(self, *args, **options):
+        vacantes = Vacante.objects.select_related('categoria', 'requisitos').filter(num_postulaciones__gt=0)
+        if options['vacante']:
+            vacantes = vacantes.filter(id__in=options['vacante'])
+
+        puntuadas = 0
+        for vacante in vacantes.iterator(chunk_size=200):
+            inicio = time.perf_counter()
+            total = calcular_puntajes(vacante, solo_pendientes=not options['todas'])
+            if total:
+                puntuadas += total
+                self.stdout.write(
+                    f'Vacante {vacante.id}: {total} postulación(es) en '
+                    f'{(time.perf_counter() - inicio) * 1000:.1f} ms'
+                )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Proceso completado. {puntuadas} postulación(es) puntuadas.'
+        ))
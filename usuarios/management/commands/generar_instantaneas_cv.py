@@ -0,0 +1,55 @@
+# usuarios/management/commands/generar_instantaneas_cv.py
+from django.core.management.base import BaseCommand
+
+from usuarios.instantaneas import instantanea_cv
+from usuarios.models import Postulacion
+
+# Postulaciones por bulk_update
+TAMANO_LOTE = 500
+
+
+class Command(BaseCommand):
+    help = ('Genera la instantánea del CV (Postulacion.cv_instantanea) de las postulaciones que no la '
+            'tienen, a partir del CV actual del interesado')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--todas', action='store_true',
+            help='Regenera también las postulaciones que ya tienen instantánea'
+        )
+
+    def handle(self, *args, **options):
+        postulaciones = Postulacion.objects.select_related(
+            'interesado', 'curriculum'
+        ).only(
+            'id', 'cv_instantanea', 'puntaje_coincidencia', 'interesado__municipio', 'curriculum__resumen_profesional'
+        ).order_by('curriculum_id')
+        if not options['todas']:
+            postulaciones = postulaciones.filter(cv_instantanea={})
+
+        # Las postulaciones de un mismo interesado comparten la instantánea de su CV
+        por_curriculum = {}
+        pendientes = []
+        generadas = 0
+        for postulacion in postulaciones.iterator(chunk_size=TAMANO_LOTE):
+            if postulacion.curriculum_id not in por_curriculum:
+                por_curriculum = {
+                    postulacion.curriculum_id: instantanea_cv(postulacion.interesado, postulacion.curriculum)
+                }
+            postulacion.cv_instantanea = por_curriculum[postulacion.curriculum_id]
+            # El puntaje de coincidencia se calcula sobre la instantánea: queda pendiente
+            postulacion.puntaje_coincidencia = None
+            pendientes.append(postulacion)
+
+            if len(pendientes) >= TAMANO_LOTE:
+                Postulacion.objects.bulk_update(pendientes, ['cv_instantanea', 'puntaje_coincidencia'])
+                generadas += len(pendientes)
+                pendientes = []
+
+        if pendientes:
+            Postulacion.objects.bulk_update(pendientes, ['cv_instantanea', 'puntaje_coincidencia'])
+            generadas += len(pendientes)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Proceso completado. {generadas} postulación(es) con instantánea del CV.'
+        ))
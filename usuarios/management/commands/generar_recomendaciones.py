@@ -0,0 +1,32 @@
+# usuarios/management/commands/generar_recomendaciones.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from usuarios.recomendaciones import generar_recomendaciones
+
+
+class Command(BaseCommand):
+    help = ('Precalcula las vacantes recomendadas de cada interesado (TF-IDF de las vacantes publicadas '
+            'contra su CV). Programar cada noche; con --solo-cambios puede correr con más frecuencia')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--solo-cambios', action='store_true',
+            help='Solo los CV modificados desde su último cálculo o que nunca se han calculado'
+        )
+        parser.add_argument(
+            '--interesado', type=int, action='append',
+            help='ID de interesado a recalcular (se puede repetir; por defecto todos)'
+        )
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        procesados, guardadas = generar_recomendaciones(
+            solo_cambios=options['solo_cambios'],
+            interesados=options['interesado']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Proceso completado. {procesados} interesado(s), {guardadas} recomendación(es) '
+            f'en {time.perf_counter() - inicio:.1f} s.'
+        ))
@@ -0,0 +1,72 @@
+# usuarios/management/commands/limpiar_medios.py
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from usuarios.imagenes import CARPETA_DERIVADOS, rutas_derivados
+from usuarios.models import Interesado, Secretaria
+from usuarios.storage import almacenamiento_contenido
+
+# Carpetas del storage por contenido que revisa el comando
+CARPETAS_MEDIOS = ['interesados', CARPETA_DERIVADOS, 'secretarias']
+
+
+class Command(BaseCommand):
+    help = 'Elimina fotos de perfil, derivados y logos que ya no referencia ningún Interesado ni Secretaría'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--gracia', type=int, default=60,
+            help='Minutos de antigüedad mínima para borrar (protege subidas en curso)'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Solo muestra lo que se eliminaría'
+        )
+
+    def _referenciados(self):
+        """Nombres de todos los archivos que algún registro usa."""
+        referenciados = set(
+            Interesado.objects.exclude(foto_perfil='').exclude(foto_perfil__isnull=True)
+            .values_list('foto_perfil', flat=True)
+        )
+        derivados = Interesado.objects.exclude(foto_derivados={}).values_list('foto_derivados', flat=True)
+        for derivado in derivados.iterator():
+            referenciados |= rutas_derivados(derivado)
+        referenciados |= set(
+            Secretaria.objects.exclude(logo='').exclude(logo__isnull=True)
+            .values_list('logo', flat=True)
+        )
+        return referenciados
+
+    def handle(self, *args, **options):
+        almacenamiento = almacenamiento_contenido()
+        referenciados = self._referenciados()
+        limite = timezone.now() - timedelta(minutes=options['gracia'])
+
+        eliminados = bytes_liberados = 0
+        for carpeta in CARPETAS_MEDIOS:
+            if not almacenamiento.exists(carpeta):
+                continue
+            _directorios, archivos = almacenamiento.listdir(carpeta)
+            for archivo in archivos:
+                nombre = f'{carpeta}/{archivo}'
+                if nombre in referenciados:
+                    continue
+                # Un archivo recién escrito puede pertenecer a una subida aún sin confirmar
+                if almacenamiento.get_modified_time(nombre) > limite:
+                    continue
+
+                tamano = almacenamiento.size(nombre)
+                if options['dry_run']:
+                    self.stdout.write(f'Se eliminaría: {nombre} ({tamano} bytes)')
+                else:
+                    almacenamiento.delete(nombre)
+                eliminados += 1
+                bytes_liberados += tamano
+
+        accion = 'se eliminarían' if options['dry_run'] else 'eliminados'
+        self.stdout.write(self.style.SUCCESS(
+            f'Proceso completado. {eliminados} archivo(s) {accion}, {bytes_liberados / 1024 / 1024:.1f} MB liberados.'
+        ))
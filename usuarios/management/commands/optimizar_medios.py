@@ -0,0 +1,94 @@
+# usuarios/management/commands/optimizar_medios.py
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import django
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from usuarios.imagenes import optimizar_foto_interesado, optimizar_logo_secretaria
+from usuarios.models import Interesado, Secretaria
+from usuarios.storage import PATRON_NOMBRE_CONTENIDO
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomprime las fotos de perfil y logos existentes, los pasa al storage por contenido '
+        'y genera los derivados de las fotos. Se puede interrumpir y volver a ejecutar.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--procesos', type=int, default=os.cpu_count() or 2,
+            help='Número de procesos del pool'
+        )
+        parser.add_argument(
+            '--forzar', action='store_true',
+            help='Regenera los derivados de todas las fotos (por ejemplo, al cambiar TAMANOS_FOTO)'
+        )
+
+    def _pendientes(self, forzar):
+        """IDs por procesar; lo ya optimizado (nombre por contenido y derivados) se omite."""
+        sin_optimizar = ~Q(foto_perfil__regex=PATRON_NOMBRE_CONTENIDO.pattern) | Q(foto_derivados={})
+        fotos = Interesado.objects.exclude(foto_perfil='').exclude(foto_perfil__isnull=True)
+        if not forzar:
+            fotos = fotos.filter(sin_optimizar)
+
+        logos = Secretaria.objects.exclude(logo='').exclude(logo__isnull=True).exclude(
+            logo__regex=PATRON_NOMBRE_CONTENIDO.pattern
+        )
+        return (
+            list(fotos.order_by('id').values_list('id', flat=True)),
+            list(logos.order_by('id').values_list('id', flat=True)),
+        )
+
+    def handle(self, *args, **options):
+        fotos, logos = self._pendientes(options['forzar'])
+        total = len(fotos) + len(logos)
+        if not total:
+            self.stdout.write(self.style.SUCCESS('No hay archivos por optimizar.'))
+            return
+
+        self.stdout.write(f'Optimizando {len(fotos)} foto(s) y {len(logos)} logo(s)...')
+        procesados = bytes_antes = bytes_despues = 0
+        errores = []
+        inicio = time.monotonic()
+
+        # 'spawn': cada proceso inicializa Django y abre su propia conexión
+        pool = ProcessPoolExecutor(
+            max_workers=max(1, options['procesos']),
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=django.setup
+        )
+        with pool:
+            trabajos = [
+                pool.map(partial(optimizar_foto_interesado, forzar=options['forzar']), fotos, chunksize=8),
+                pool.map(optimizar_logo_secretaria, logos, chunksize=8),
+            ]
+            for resultados in trabajos:
+                for antes, despues, error in resultados:
+                    procesados += 1
+                    if error:
+                        errores.append(error)
+                    bytes_antes += antes
+                    bytes_despues += despues
+                    if procesados % 100 == 0:
+                        self.stdout.write(f'{procesados}/{total} procesados...')
+
+        segundos = max(time.monotonic() - inicio, 0.001)
+        ahorro = bytes_antes - bytes_despues
+        for error in errores:
+            self.stderr.write(error)
+
+        self.stdout.write(
+            f'{procesados} archivo(s) en {segundos:.1f} s '
+            f'({procesados / segundos:.1f} archivos/s, {bytes_antes / 1024 / 1024 / segundos:.1f} MB/s leídos).'
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Proceso completado. {bytes_antes / 1024 / 1024:.1f} MB -> {bytes_despues / 1024 / 1024:.1f} MB, '
+            f'{ahorro / 1024 / 1024:.1f} MB ahorrados ({len(errores)} con error). '
+            f'Ejecuta limpiar_medios para borrar los originales reemplazados.'
+        ))
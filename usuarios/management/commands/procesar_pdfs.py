@@ -0,0 +1,86 @@
+# usuarios/management/commands/procesar_pdfs.py
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import django
+from django.core.management.base import BaseCommand
+
+from usuarios.pdf import (
+    procesar_trabajo_pdf,
+    reclamar_trabajos_pdf,
+    recuperar_trabajos_abandonados,
+    registrar_resultado_pdf,
+)
+
+
+class Command(BaseCommand):
+    help = 'Genera en segundo plano los PDF de CV solicitados (tabla TrabajoPDF) con un pool de procesos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--procesos', type=int, default=max(1, (os.cpu_count() or 2) // 2),
+            help='Número de procesos de WeasyPrint (limita el CPU que usa la generación de PDF)'
+        )
+        parser.add_argument(
+            '--intervalo', type=float, default=1.0,
+            help='Segundos de espera cuando la cola está vacía'
+        )
+        parser.add_argument(
+            '--una-vez', action='store_true',
+            help='Procesa los trabajos pendientes y termina'
+        )
+
+    def handle(self, *args, **options):
+        procesos = max(1, options['procesos'])
+        intervalo = options['intervalo']
+
+        self.stdout.write(self.style.SUCCESS(f'Worker de PDF iniciado con {procesos} proceso(s).'))
+        generados = fallidos = 0
+
+        # 'spawn' evita heredar la conexión a la base de datos del proceso principal;
+        # cada proceso hijo inicializa Django y abre su propia conexión
+        pool = ProcessPoolExecutor(
+            max_workers=procesos,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=django.setup
+        )
+        with pool:
+            en_curso = set()
+            ultima_recuperacion = 0.0
+            try:
+                while True:
+                    if time.monotonic() - ultima_recuperacion > 60:
+                        recuperados = recuperar_trabajos_abandonados()
+                        if recuperados:
+                            self.stdout.write(f'{recuperados} trabajo(s) abandonado(s) regresaron a la cola.')
+                        ultima_recuperacion = time.monotonic()
+
+                    # Mantener como máximo un trabajo por proceso
+                    libres = procesos - len(en_curso)
+                    if libres > 0:
+                        for trabajo_id in reclamar_trabajos_pdf(libres):
+                            en_curso.add(pool.submit(procesar_trabajo_pdf, trabajo_id))
+
+                    if not en_curso:
+                        if options['una_vez']:
+                            break
+                        time.sleep(intervalo)
+                        continue
+
+                    terminados, en_curso = wait(en_curso, timeout=intervalo, return_when=FIRST_COMPLETED)
+                    for futuro in terminados:
+                        trabajo_id, error = futuro.result()
+                        registrar_resultado_pdf(trabajo_id, error)
+                        if error:
+                            fallidos += 1
+                            self.stderr.write(f'Error en trabajo {trabajo_id}: {error}')
+                        else:
+                            generados += 1
+            except KeyboardInterrupt:
+                self.stdout.write('Deteniendo worker...')
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Proceso completado. {generados} PDF generados, {fallidos} con error.')
+        )
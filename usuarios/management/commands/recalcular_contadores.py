@@ -0,0 +1,25 @@
+# usuarios/management/commands/recalcular_contadores.py
+from django.core.management.base import BaseCommand
+
+from usuarios.estadisticas import recalcular_contadores
+from usuarios.models import Vacante
+
+
+class Command(BaseCommand):
+    help = 'Recalcula los contadores de postulaciones de las vacantes (num_postulaciones y por estado)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--vacante', type=int, action='append',
+            help='ID de vacante a recalcular (se puede repetir; por defecto todas)'
+        )
+
+    def handle(self, *args, **options):
+        vacantes = Vacante.objects.all()
+        if options['vacante']:
+            vacantes = vacantes.filter(id__in=options['vacante'])
+
+        corregidas = recalcular_contadores(vacantes)
+        self.stdout.write(self.style.SUCCESS(
+            f'Proceso completado. {corregidas} vacante(s) con contadores corregidos.'
+        ))
@@ -0,0 +1,56 @@
+# usuarios/migrations/0009_busqueda_texto_completo.py
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import Value
+
+
+def poblar_search_vector(apps, schema_editor):
+    """Calcula el vector de búsqueda de las vacantes existentes."""
+    Vacante = apps.get_model('usuarios', 'Vacante')
+    RequisitoVacante = apps.get_model('usuarios', 'RequisitoVacante')
+    municipios = dict(Vacante._meta.get_field('municipio').choices)
+
+    def unir(*textos):
+        return ' '.join(texto for texto in textos if texto)
+
+    for vacante in Vacante.objects.select_related('categoria', 'secretaria').iterator():
+        requisitos = RequisitoVacante.objects.filter(vacante_id=vacante.id).first()
+        texto_requisitos = ''
+        if requisitos:
+            texto_requisitos = unir(
+                requisitos.descripcion_requisitos,
+                requisitos.educacion_minima,
+                requisitos.experiencia_minima,
+            )
+
+        Vacante.objects.filter(id=vacante.id).update(search_vector=(
+            SearchVector(Value(vacante.titulo or ''), weight='A', config='spanish') +
+            SearchVector(Value(unir(texto_requisitos, vacante.categoria.nombre)), weight='B', config='spanish') +
+            SearchVector(Value(vacante.descripcion or ''), weight='C', config='spanish') +
+            SearchVector(
+                Value(unir(vacante.secretaria.nombre, municipios.get(vacante.municipio, ''))),
+                weight='D', config='spanish'
+            )
+        ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0008_agregar_postulaciones'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vacante',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='vacante',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='vacante_search_vector_gin'),
+        ),
+        migrations.RunPython(poblar_search_vector, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# usuarios/migrations/0010_busqueda_trigramas.py
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension, UnaccentExtension
+import django.db.models.functions.text
+from django.db import migrations, models
+
+# unaccent() es STABLE y no se puede usar directamente en un índice; este envoltorio
+# fija el diccionario y se declara IMMUTABLE para permitir el índice de expresión.
+CREAR_FUNCION_UNACCENT = """
+CREATE OR REPLACE FUNCTION usuarios_unaccent(text) RETURNS text AS $$
+    SELECT public.unaccent('public.unaccent'::regdictionary, $1)
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT;
+"""
+
+ELIMINAR_FUNCION_UNACCENT = 'DROP FUNCTION IF EXISTS usuarios_unaccent(text);'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0009_busqueda_texto_completo'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        UnaccentExtension(),
+        migrations.RunSQL(CREAR_FUNCION_UNACCENT, ELIMINAR_FUNCION_UNACCENT),
+        migrations.AddIndex(
+            model_name='vacante',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(models.Func(django.db.models.functions.text.Lower('titulo'), function='usuarios_unaccent'), name='gin_trgm_ops'), name='vacante_titulo_trgm_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='vacante',
+            index=models.Index(fields=['municipio'], name='vacante_municipio_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# usuarios/migrations/0011_paginacion_cursor.py
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0010_busqueda_trigramas'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vacante',
+            index=models.Index(condition=models.Q(('aprobada', True), ('estado_vacante', 'publicada')), fields=['-fecha_publicacion', '-id'], name='vacante_publicadas_idx'),
+        ),
+    ]
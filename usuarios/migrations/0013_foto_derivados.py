@@ -0,0 +1,18 @@
+# usuarios/migrations/0013_foto_derivados.py
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0012_cola_pdf'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interesado',
+            name='foto_derivados',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
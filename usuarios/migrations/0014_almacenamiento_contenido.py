@@ -0,0 +1,24 @@
+# usuarios/migrations/0014_almacenamiento_contenido.py
+
+import usuarios.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0013_foto_derivados'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='interesado',
+            name='foto_perfil',
+            field=models.ImageField(blank=True, null=True, storage=usuarios.storage.almacenamiento_contenido, upload_to='interesados/'),
+        ),
+        migrations.AlterField(
+            model_name='secretaria',
+            name='logo',
+            field=models.ImageField(blank=True, null=True, storage=usuarios.storage.almacenamiento_contenido, upload_to='secretarias/'),
+        ),
+    ]
@@ -0,0 +1,72 @@
+# usuarios/migrations/0015_contadores_postulaciones.py
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+ESTADOS = {
+    'enviada': 'num_enviadas',
+    'en_revision': 'num_en_revision',
+    'preseleccionado': 'num_preseleccionados',
+    'entrevista': 'num_entrevista',
+    'aceptada': 'num_aceptadas',
+    'rechazada': 'num_rechazadas',
+}
+
+
+def poblar_contadores(apps, schema_editor):
+    """Calcula los contadores de las postulaciones existentes."""
+    Vacante = apps.get_model('usuarios', 'Vacante')
+
+    agregados = {'num_postulaciones': Count('postulaciones')}
+    for estado, campo in ESTADOS.items():
+        agregados[campo] = Count('postulaciones', filter=Q(postulaciones__estado=estado))
+
+    for fila in Vacante.objects.order_by().annotate(**agregados).values('id', *agregados).iterator():
+        vacante_id = fila.pop('id')
+        if fila['num_postulaciones']:
+            Vacante.objects.filter(id=vacante_id).update(**fila)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0014_almacenamiento_contenido'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vacante',
+            name='num_aceptadas',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='vacante',
+            name='num_en_revision',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='vacante',
+            name='num_entrevista',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='vacante',
+            name='num_enviadas',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='vacante',
+            name='num_postulaciones',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='vacante',
+            name='num_preseleccionados',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='vacante',
+            name='num_rechazadas',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(poblar_contadores, migrations.RunPython.noop),
+    ]
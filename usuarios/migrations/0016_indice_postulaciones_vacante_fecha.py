@@ -0,0 +1,17 @@
+# usuarios/migrations/0016_indice_postulaciones_vacante_fecha.py
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0015_contadores_postulaciones'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='postulacion',
+            index=models.Index(fields=['vacante', '-fecha_postulacion'], name='postulacion_vacante_fecha_idx'),
+        ),
+    ]
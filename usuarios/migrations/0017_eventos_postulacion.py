@@ -0,0 +1,65 @@
+# usuarios/migrations/0017_eventos_postulacion.py
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+TAMANO_LOTE = 1000
+
+
+def poblar_eventos(apps, schema_editor):
+    """
+    Historial inicial de las postulaciones existentes: su creación y, si ya no
+    están en 'enviada', la entrada a su estado actual (la fecha exacta de los
+    estados intermedios no se conoce; se usa fecha_actualizacion).
+    """
+    Postulacion = apps.get_model('usuarios', 'Postulacion')
+    PostulacionEvento = apps.get_model('usuarios', 'PostulacionEvento')
+
+    eventos = []
+    filas = Postulacion.objects.order_by('id').values(
+        'id', 'vacante_id', 'estado', 'fecha_postulacion', 'fecha_actualizacion'
+    )
+    for fila in filas.iterator(chunk_size=TAMANO_LOTE):
+        eventos.append(PostulacionEvento(
+            postulacion_id=fila['id'], vacante_id=fila['vacante_id'],
+            estado_nuevo='enviada', fecha=fila['fecha_postulacion']
+        ))
+        if fila['estado'] != 'enviada':
+            eventos.append(PostulacionEvento(
+                postulacion_id=fila['id'], vacante_id=fila['vacante_id'],
+                estado_anterior='enviada', estado_nuevo=fila['estado'], fecha=fila['fecha_actualizacion']
+            ))
+        if len(eventos) >= TAMANO_LOTE:
+            PostulacionEvento.objects.bulk_create(eventos)
+            eventos = []
+    PostulacionEvento.objects.bulk_create(eventos)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0016_indice_postulaciones_vacante_fecha'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostulacionEvento',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('estado_anterior', models.CharField(blank=True, choices=[('enviada', 'Enviada'), ('en_revision', 'En Revisión'), ('preseleccionado', 'Preseleccionado'), ('entrevista', 'En Entrevista'), ('aceptada', 'Aceptada'), ('rechazada', 'Rechazada'), ('retirada', 'Retirada')], help_text='Vacío cuando el evento es la postulación misma', max_length=20)),
+                ('estado_nuevo', models.CharField(choices=[('enviada', 'Enviada'), ('en_revision', 'En Revisión'), ('preseleccionado', 'Preseleccionado'), ('entrevista', 'En Entrevista'), ('aceptada', 'Aceptada'), ('rechazada', 'Rechazada'), ('retirada', 'Retirada')], max_length=20)),
+                ('fecha', models.DateTimeField(default=django.utils.timezone.now)),
+                ('postulacion', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='eventos', to='usuarios.postulacion')),
+                ('vacante', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='eventos_postulaciones', to='usuarios.vacante')),
+            ],
+            options={
+                'verbose_name': 'Evento de Postulación',
+                'verbose_name_plural': 'Eventos de Postulaciones',
+                'ordering': ['fecha'],
+                'indexes': [models.Index(fields=['postulacion', 'fecha'], name='evento_postulacion_fecha_idx'), models.Index(fields=['vacante', 'fecha'], name='evento_vacante_fecha_idx'), django.contrib.postgres.indexes.BrinIndex(fields=['fecha'], name='evento_fecha_brin')],
+            },
+        ),
+        migrations.RunPython(poblar_eventos, migrations.RunPython.noop),
+    ]
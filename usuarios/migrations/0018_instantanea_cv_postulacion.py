@@ -0,0 +1,18 @@
+# usuarios/migrations/0018_instantanea_cv_postulacion.py
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0017_eventos_postulacion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='postulacion',
+            name='cv_instantanea',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
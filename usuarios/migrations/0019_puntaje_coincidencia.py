@@ -0,0 +1,18 @@
+# usuarios/migrations/0019_puntaje_coincidencia.py
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0018_instantanea_cv_postulacion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='postulacion',
+            name='puntaje_coincidencia',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# usuarios/migrations/0020_vacantes_recomendadas.py
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0019_puntaje_coincidencia'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VacanteRecomendada',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('posicion', models.PositiveSmallIntegerField(help_text='1 = la más afín al CV')),
+                ('puntaje', models.FloatField(help_text='Similitud coseno TF-IDF entre el CV y la vacante')),
+                ('fecha_calculo', models.DateTimeField(default=django.utils.timezone.now)),
+                ('interesado', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vacantes_recomendadas', to='usuarios.interesado')),
+                ('vacante', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recomendaciones', to='usuarios.vacante')),
+            ],
+            options={
+                'verbose_name': 'Vacante Recomendada',
+                'verbose_name_plural': 'Vacantes Recomendadas',
+                'ordering': ['interesado', 'posicion'],
+                'unique_together': {('interesado', 'posicion')},
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# usuarios/migrations/0021_trabajopdf_postulacion.py
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0020_vacantes_recomendadas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trabajopdf',
+            name='postulacion',
+            field=models.ForeignKey(blank=True, help_text='Si se indica, el PDF se genera desde la instantánea del CV de esta postulación', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='trabajos_pdf', to='usuarios.postulacion'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# usuarios/migrations/0022_curriculum_fecha_recomendaciones.py
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0021_trabajopdf_postulacion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='curriculum',
+            name='fecha_recomendaciones',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Último cálculo de sus vacantes recomendadas (aunque no haya resultado ninguna)', null=True),
+        ),
+    ]
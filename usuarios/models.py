@@ -1,11 +1,18 @@
 # usuarios/models.py
 from django.db import models
+from django.db.models import Func
+from django.db.models.functions import Lower
+from django.contrib.postgres.indexes import BrinIndex, GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth.models import User, AbstractUser, BaseUserManager
 from django.utils.translation import gettext_lazy as _
 from django.contrib.humanize.templatetags.humanize import intcomma # Para formatear con comas
 from django.utils.translation import gettext_lazy as _
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from django.utils import timezone
+
+from .storage import almacenamiento_contenido
 
 class UserManager(BaseUserManager):
     """Define una clase gestora de usuario para crear usuarios con email."""
@@ -191,7 +198,9 @@ class Interesado(models.Model):
     # CAMPO ELIMINADO: direccion
     municipio = models.CharField(max_length=50, choices=MUNICIPIOS_ESTADO_MEXICO, blank=True, null=True, verbose_name="Municipio")
     codigo_postal = models.CharField(max_length=10, blank=True, null=True)
-    foto_perfil = models.ImageField(upload_to='interesados/', blank=True, null=True)
+    foto_perfil = models.ImageField(upload_to='interesados/', storage=almacenamiento_contenido, blank=True, null=True)
+    # Versiones reducidas de la foto (WebP + JPEG por tamaño), ver usuarios/imagenes.py
+    foto_derivados = models.JSONField(default=dict, blank=True, editable=False)
 
     def __str__(self):
         if self.nombre and self.apellido_paterno:
@@ -232,7 +241,7 @@ class Secretaria(models.Model):
     nombre = models.CharField(max_length=100)
     rfc = models.CharField(max_length=13, unique=True)
     descripcion = models.TextField(blank=True, null=True)
-    logo = models.ImageField(upload_to='secretarias/', blank=True, null=True)
+    logo = models.ImageField(upload_to='secretarias/', storage=almacenamiento_contenido, blank=True, null=True)
     sitio_web = models.URLField(blank=True, null=True)
     ciudad = models.CharField(max_length=50, blank=True, null=True)
     estado = models.CharField(max_length=50, blank=True, null=True)
@@ -470,9 +479,44 @@ class Vacante(models.Model):
     max_postulantes = models.IntegerField(choices=[(5, '5'), (10, '10'), (20, '20'), (50, '50')], default=20)
     max_postulaciones_por_interesado = models.IntegerField(default=1)
 
+    # Búsqueda de texto completo (se mantiene desde usuarios/signals.py)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    # Contadores de postulaciones, actualizados con F() desde usuarios/signals.py en la
+    # misma transacción que crea, elimina o cambia de estado una Postulacion.
+    # `python manage.py recalcular_contadores` los reconstruye si se desfasan.
+    num_postulaciones = models.PositiveIntegerField(default=0, editable=False)
+    num_enviadas = models.PositiveIntegerField(default=0, editable=False)
+    num_en_revision = models.PositiveIntegerField(default=0, editable=False)
+    num_preseleccionados = models.PositiveIntegerField(default=0, editable=False)
+    num_entrevista = models.PositiveIntegerField(default=0, editable=False)
+    num_aceptadas = models.PositiveIntegerField(default=0, editable=False)
+    num_rechazadas = models.PositiveIntegerField(default=0, editable=False)
+
+    # Contador de cada estado de Postulacion
+    CONTADORES_ESTADO = {
+        'enviada': 'num_enviadas',
+        'en_revision': 'num_en_revision',
+        'preseleccionado': 'num_preseleccionados',
+        'entrevista': 'num_entrevista',
+        'aceptada': 'num_aceptadas',
+        'rechazada': 'num_rechazadas',
+    }
+    CAMPOS_CONTADORES = ('num_postulaciones',) + tuple(CONTADORES_ESTADO.values())
+
     def __str__(self):
         return f"{self.titulo} - {self.secretaria.nombre}"
 
+    def save(self, *args, **kwargs):
+        # Los contadores solo se modifican con F(): guardar la instancia completa
+        # (por ejemplo al editar la vacante) no debe pisarlos con valores viejos
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                campo.name for campo in self._meta.concrete_fields
+                if not campo.primary_key and campo.name not in self.CAMPOS_CONTADORES
+            ]
+        super().save(*args, **kwargs)
+
     @property
     def es_borrador(self):
         return self.estado_vacante == 'borrador'
@@ -504,6 +548,22 @@ class Vacante(models.Model):
         verbose_name = "Vacante"
         verbose_name_plural = "Vacantes"
         ordering = ['-fecha_publicacion']
+        indexes = [
+            GinIndex(fields=['search_vector'], name='vacante_search_vector_gin'),
+            # Búsqueda tolerante a acentos y errores de dedo (pg_trgm + unaccent).
+            # usuarios_unaccent es un envoltorio IMMUTABLE creado en la migración 0010.
+            GinIndex(
+                OpClass(Func(Lower('titulo'), function='usuarios_unaccent'), name='gin_trgm_ops'),
+                name='vacante_titulo_trgm_gin'
+            ),
+            models.Index(fields=['municipio'], name='vacante_municipio_idx'),
+            # Llave de la paginación por cursor de los listados públicos
+            models.Index(
+                fields=['-fecha_publicacion', '-id'],
+                name='vacante_publicadas_idx',
+                condition=models.Q(estado_vacante='publicada', aprobada=True)
+            ),
+        ]
 
 
 class RequisitoVacante(models.Model):
@@ -537,6 +597,10 @@ class Curriculum(models.Model):
         help_text="Describe brevemente tu perfil y objetivos profesionales"
     )
     fecha_actualizacion = models.DateTimeField(auto_now=True)
+    fecha_recomendaciones = models.DateTimeField(
+        null=True, blank=True, editable=False,
+        help_text="Último cálculo de sus vacantes recomendadas (aunque no haya resultado ninguna)"
+    )
 
     def __str__(self):
         return f"CV de {self.interesado.nombre_completo}"
@@ -714,6 +778,10 @@ class Postulacion(models.Model):
     mensaje_motivacion = models.TextField(blank=True, null=True, help_text="Mensaje opcional del candidato")
     notas_reclutador = models.TextField(blank=True, null=True, help_text="Notas del reclutador")
     fecha_actualizacion = models.DateTimeField(auto_now=True)
+    # CV tal como estaba al postularse (ver usuarios/instantaneas.py)
+    cv_instantanea = models.JSONField(default=dict, blank=True, editable=False)
+    # Coincidencia (0-100) del CV con la vacante; None = pendiente (ver usuarios/coincidencia.py)
+    puntaje_coincidencia = models.FloatField(null=True, blank=True, editable=False)
 
     def __str__(self):
         return f"{self.interesado.nombre_completo} - {self.vacante.titulo}"
@@ -737,4 +805,120 @@ class Postulacion(models.Model):
         verbose_name = "Postulación"
         verbose_name_plural = "Postulaciones"
         unique_together = ['interesado', 'vacante']  # Un interesado solo puede postularse una vez por vacante
-        ordering = ['-fecha_postulacion']
\ No newline at end of file
+        ordering = ['-fecha_postulacion']
+        indexes = [
+            # Listado de postulantes por fecha y conteo de "nuevos hoy" por vacante
+            models.Index(fields=['vacante', '-fecha_postulacion'], name='postulacion_vacante_fecha_idx'),
+        ]
+
+
+class PostulacionEvento(models.Model):
+    """
+    Registro de solo inserción de los cambios de estado de las postulaciones.
+
+    Cada fila marca la entrada a un estado; el tiempo que una postulación pasó
+    en él es la diferencia con su siguiente evento. Las métricas de embudo y de
+    tiempo de contratación se calculan aquí sin recorrer la tabla Postulacion.
+    """
+
+    ESTADOS_EVENTO = Postulacion.ESTADOS_POSTULACION + (
+        ('retirada', 'Retirada'),
+    )
+
+    # SET_NULL: el historial se conserva aunque el interesado retire la postulación
+    postulacion = models.ForeignKey(
+        Postulacion, on_delete=models.SET_NULL, null=True, blank=True, related_name='eventos'
+    )
+    vacante = models.ForeignKey(Vacante, on_delete=models.CASCADE, related_name='eventos_postulaciones')
+    estado_anterior = models.CharField(
+        max_length=20, choices=ESTADOS_EVENTO, blank=True,
+        help_text="Vacío cuando el evento es la postulación misma"
+    )
+    estado_nuevo = models.CharField(max_length=20, choices=ESTADOS_EVENTO)
+    fecha = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Postulación {self.postulacion_id}: {self.estado_anterior or '-'} -> {self.estado_nuevo}"
+
+    @classmethod
+    def desde_postulacion(cls, postulacion, estado_anterior='', estado_nuevo=None, fecha=None):
+        """Evento sin guardar (para save() o bulk_create()) del estado actual de la postulación."""
+        return cls(
+            postulacion_id=postulacion.id,
+            vacante_id=postulacion.vacante_id,
+            estado_anterior=estado_anterior or '',
+            estado_nuevo=estado_nuevo or postulacion.estado,
+            fecha=fecha or timezone.now()
+        )
+
+    class Meta:
+        verbose_name = "Evento de Postulación"
+        verbose_name_plural = "Eventos de Postulaciones"
+        ordering = ['fecha']
+        indexes = [
+            # Historial de una postulación y métricas por vacante en un rango de fechas
+            models.Index(fields=['postulacion', 'fecha'], name='evento_postulacion_fecha_idx'),
+            models.Index(fields=['vacante', 'fecha'], name='evento_vacante_fecha_idx'),
+            # Tabla de solo inserción: las fechas crecen con el orden físico y un BRIN
+            # cubre los rangos globales ocupando unas cuantas páginas
+            BrinIndex(fields=['fecha'], name='evento_fecha_brin'),
+        ]
+
+
+class TrabajoPDF(models.Model):
+    """Trabajo en cola para generar el PDF de un CV fuera del ciclo de la petición."""
+
+    ESTADOS_TRABAJO = (
+        ('pendiente', 'Pendiente'),
+        ('procesando', 'Procesando'),
+        ('listo', 'Listo'),
+        ('error', 'Error'),
+    )
+
+    interesado = models.ForeignKey(Interesado, on_delete=models.CASCADE, related_name='trabajos_pdf')
+    version = models.CharField(max_length=32, help_text="Versión del CV que se debe generar")
+    postulacion = models.ForeignKey(
+        Postulacion, on_delete=models.CASCADE, null=True, blank=True, related_name='trabajos_pdf',
+        help_text="Si se indica, el PDF se genera desde la instantánea del CV de esta postulación"
+    )
+    estado = models.CharField(max_length=15, choices=ESTADOS_TRABAJO, default='pendiente')
+    intentos = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True, null=True)
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"PDF de {self.interesado} ({self.get_estado_display()})"
+
+    class Meta:
+        verbose_name = "Trabajo de PDF"
+        verbose_name_plural = "Trabajos de PDF"
+        unique_together = ['interesado', 'version']
+        ordering = ['fecha_creacion']
+        indexes = [
+            models.Index(fields=['estado', 'fecha_creacion'], name='trabajopdf_cola_idx'),
+        ]
+
+
+class VacanteRecomendada(models.Model):
+    """
+    Vacante sugerida a un interesado, precalculada por `python manage.py generar_recomendaciones`.
+
+    El perfil y "Mis postulaciones" leen las de un interesado en una sola consulta
+    por el índice único (interesado, posicion), sin ejecutar búsquedas.
+    """
+
+    interesado = models.ForeignKey(Interesado, on_delete=models.CASCADE, related_name='vacantes_recomendadas')
+    vacante = models.ForeignKey(Vacante, on_delete=models.CASCADE, related_name='recomendaciones')
+    posicion = models.PositiveSmallIntegerField(help_text="1 = la más afín al CV")
+    puntaje = models.FloatField(help_text="Similitud coseno TF-IDF entre el CV y la vacante")
+    fecha_calculo = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.interesado} -> {self.vacante.titulo} (#{self.posicion})"
+
+    class Meta:
+        verbose_name = "Vacante Recomendada"
+        verbose_name_plural = "Vacantes Recomendadas"
+        unique_together = ['interesado', 'posicion']
+        ordering = ['interesado', 'posicion']
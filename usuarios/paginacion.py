@@ -0,0 +1,144 @@
+# usuarios/paginacion.py
+import datetime
+import json
+
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+# Salt propio para que los cursores no sirvan como firma en otro contexto
+SALT_CURSOR = 'usuarios.paginacion.cursor'
+
+
+class _EncoderCursor(DjangoJSONEncoder):
+    """Como DjangoJSONEncoder pero conserva los microsegundos de las fechas."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class _SerializadorCursor(signing.JSONSerializer):
+    """Serializa fechas y decimales de la llave dentro del cursor."""
+
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(',', ':'), cls=_EncoderCursor).encode('latin-1')
+
+
+class PaginaCursor:
+    """Página de resultados obtenida con PaginadorCursor."""
+
+    def __init__(self, object_list, cursor_siguiente=None, cursor_anterior=None):
+        self.object_list = object_list
+        self.cursor_siguiente = cursor_siguiente
+        self.cursor_anterior = cursor_anterior
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    def has_next(self):
+        return self.cursor_siguiente is not None
+
+    def has_previous(self):
+        return self.cursor_anterior is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class PaginadorCursor:
+    """
+    Paginación por llave (keyset) en lugar de LIMIT/OFFSET.
+
+    Usa el orden del queryset (por ejemplo ['-fecha_publicacion', '-id']) como llave:
+    cada página filtra "después de la última fila vista", así la página 100 cuesta
+    lo mismo que la primera y no se ejecuta COUNT(*). El último campo del orden
+    debe ser único (normalmente 'id') para que la llave no tenga empates.
+    """
+
+    def __init__(self, queryset, por_pagina):
+        self.queryset = queryset
+        self.por_pagina = por_pagina
+        self.orden = [str(campo) for campo in queryset.query.order_by]
+        if not self.orden:
+            raise ValueError('PaginadorCursor requiere un queryset ordenado')
+
+    def _campos(self):
+        """Lista de (campo, descendente) a partir del orden del queryset."""
+        return [(campo.lstrip('-'), campo.startswith('-')) for campo in self.orden]
+
+    def _filtro_despues_de(self, valores, hacia_atras=False):
+        """
+        Construye la comparación lexicográfica (a, b, c) > (x, y, z) según la dirección
+        de cada campo: OR de (iguales en los campos previos y mayor/menor en el actual).
+        """
+        filtro = Q()
+        iguales = Q()
+        for (campo, descendente), valor in zip(self._campos(), valores):
+            # Avanzar en un orden descendente significa buscar valores menores
+            menor = descendente != hacia_atras
+            filtro |= iguales & Q(**{f'{campo}__{"lt" if menor else "gt"}': valor})
+            iguales &= Q(**{campo: valor})
+        return filtro
+
+    def _cursor(self, objeto, direccion):
+        valores = [getattr(objeto, campo) for campo, _ in self._campos()]
+        return signing.dumps(
+            {'v': valores, 'd': direccion},
+            salt=SALT_CURSOR,
+            serializer=_SerializadorCursor,
+            compress=True
+        )
+
+    def _leer_cursor(self, cursor):
+        """Devuelve (valores, dirección) o (None, None) si el cursor no es válido."""
+        if not cursor:
+            return None, None
+        try:
+            datos = signing.loads(cursor, salt=SALT_CURSOR, serializer=_SerializadorCursor)
+            valores, direccion = datos['v'], datos['d']
+        except (signing.BadSignature, KeyError, TypeError, ValueError):
+            return None, None
+        if direccion not in ('siguiente', 'anterior') or len(valores) != len(self.orden):
+            return None, None
+        return valores, direccion
+
+    def get_page(self, cursor=None):
+        """Obtiene la página que sigue (o precede) al cursor; sin cursor, la primera."""
+        valores, direccion = self._leer_cursor(cursor)
+        hacia_atras = direccion == 'anterior'
+
+        queryset = self.queryset
+        if valores is not None:
+            queryset = queryset.filter(self._filtro_despues_de(valores, hacia_atras))
+        if hacia_atras:
+            queryset = queryset.reverse()
+
+        # Se pide una fila extra solo para saber si hay más resultados
+        filas = list(queryset[:self.por_pagina + 1])
+        hay_mas = len(filas) > self.por_pagina
+        filas = filas[:self.por_pagina]
+        if hacia_atras:
+            filas.reverse()
+
+        if not filas:
+            return PaginaCursor([])
+
+        if hacia_atras:
+            tiene_siguiente, tiene_anterior = True, hay_mas
+        else:
+            tiene_siguiente, tiene_anterior = hay_mas, valores is not None
+
+        return PaginaCursor(
+            filas,
+            cursor_siguiente=self._cursor(filas[-1], 'siguiente') if tiene_siguiente else None,
+            cursor_anterior=self._cursor(filas[0], 'anterior') if tiene_anterior else None,
+        )
+
@@ -0,0 +1,503 @@
+# usuarios/pdf.py
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from datetime import timedelta
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.http import FileResponse
+from django.template.loader import get_template, render_to_string
+from django.utils import timezone
+from weasyprint import CSS, HTML, default_url_fetcher
+from weasyprint.text.fonts import FontConfiguration
+
+from .instantaneas import contexto_instantanea
+from .models import Interesado, TrabajoPDF
+
+# Los CV contienen datos personales: se guardan fuera de MEDIA_ROOT
+CV_PDF_ROOT = Path(getattr(settings, 'CV_PDF_ROOT', settings.BASE_DIR / 'private' / 'cv_pdf'))
+
+# Plantilla y hojas de estilo del CV, cargadas una vez por proceso (ver RenderizadorPDF)
+PLANTILLA_CV = 'usuarios/cv_pdf_template.html'
+HOJAS_ESTILO_CV = ['css/cv_pdf.css']
+
+# Entradas de las cachés en memoria del renderizador (recursos descargados e
+# imágenes decodificadas) antes de vaciarlas: las fotos de cada CV son distintas
+MAX_ENTRADAS_CACHE_PDF = 64
+
+# Reintentos antes de dejar un trabajo en estado de error
+MAX_INTENTOS_PDF = 3
+
+# Un trabajo "procesando" más antiguo que esto se considera abandonado (worker caído)
+TIEMPO_MAXIMO_PROCESANDO = timedelta(minutes=5)
+
+# Segundos que una descarga masiva espera a que el worker genere los PDF faltantes
+ESPERA_ZIP_CV = getattr(settings, 'ESPERA_ZIP_CV', 300)
+
+# Segundos entre consultas al estado de los trabajos durante una descarga masiva
+INTERVALO_ZIP_CV = 1.0
+
+# Tamaño de los bloques con que se copia cada PDF al ZIP
+TAMANO_BLOQUE_ZIP = 64 * 1024
+
+
+def contexto_cv(interesado, curriculum):
+    """Datos que usa usuarios/cv_pdf_template.html."""
+    return {
+        'interesado': interesado,
+        'curriculum': curriculum,
+        'experiencias': curriculum.experiencias.all(),
+        'educaciones': curriculum.educaciones.all(),
+        'habilidades': curriculum.habilidades.select_related('habilidad'),
+        'idiomas': curriculum.idiomas.all(),
+    }
+
+
+def contexto_cv_instantanea(interesado, instantanea):
+    """Datos de usuarios/cv_pdf_template.html tomados de la instantánea de una postulación."""
+    return {'interesado': interesado, **contexto_instantanea(instantanea)}
+
+
+def _instantanea(postulacion):
+    """Instantánea del CV de la postulación, o None si se usa el CV actual."""
+    return postulacion.cv_instantanea if postulacion is not None else None
+
+
+@lru_cache(maxsize=None)
+def firma_diseno_cv():
+    """
+    Hash de la plantilla y las hojas de estilo del CV, calculado una vez por proceso.
+
+    Forma parte de version_cv(): al desplegar un cambio de diseño los PDF en
+    caché dejan de coincidir y se generan de nuevo.
+    """
+    archivos = [get_template(PLANTILLA_CV).origin.name]
+    archivos += [RenderizadorPDF._ruta_estatico(nombre) for nombre in HOJAS_ESTILO_CV]
+    firma = hashlib.sha256()
+    for archivo in archivos:
+        with open(archivo, 'rb') as contenido:
+            firma.update(contenido.read())
+    return firma.hexdigest()[:16]
+
+
+def _datos_personales(interesado):
+    return (
+        interesado.nombre,
+        interesado.apellido_paterno,
+        interesado.apellido_materno,
+        interesado.telefono,
+        interesado.municipio,
+        interesado.codigo_postal,
+        interesado.usuario.email,
+    )
+
+
+def version_cv(interesado, curriculum, postulacion=None):
+    """
+    Versión del contenido del CV sin consultar las tablas hijas.
+
+    Curriculum.fecha_actualizacion cambia con cualquier alta, edición o baja de
+    experiencias, educación, habilidades o idiomas (ver usuarios/signals.py); los
+    datos personales del encabezado y la firma del diseño (firma_diseno_cv) se
+    incluyen directamente en el hash.
+
+    Con una `postulacion` con instantánea, la versión es el hash de su contenido
+    (sin la fecha): las postulaciones enviadas con el mismo CV comparten el PDF.
+    """
+    instantanea = _instantanea(postulacion)
+    if instantanea:
+        contenido = json.dumps(
+            {clave: valor for clave, valor in instantanea.items() if clave != 'fecha'}, sort_keys=True
+        )
+    else:
+        contenido = curriculum.fecha_actualizacion.isoformat()
+    datos = '|'.join(str(valor) for valor in (firma_diseno_cv(), contenido, *_datos_personales(interesado)))
+    return hashlib.sha256(datos.encode()).hexdigest()[:16]
+
+
+def ruta_cv_pdf(interesado, curriculum, postulacion=None):
+    """
+    Ruta del PDF en caché para la versión actual del CV, o para la instantánea de
+    la postulación (en su propio directorio: no se borran al cambiar el CV).
+    """
+    directorio = CV_PDF_ROOT / str(interesado.id)
+    if _instantanea(postulacion):
+        directorio = directorio / 'postulaciones'
+    return directorio / f'{version_cv(interesado, curriculum, postulacion)}.pdf'
+
+
+class RenderizadorPDF:
+    """
+    Servicio de WeasyPrint que vive todo el proceso.
+
+    Conserva entre renders lo que no depende del CV: la configuración de fuentes
+    (fontconfig resuelve las familias una sola vez), las hojas de estilo ya
+    analizadas, los recursos estáticos descargados por el url_fetcher y las
+    imágenes ya decodificadas. Cada render solo analiza el HTML del CV.
+
+    Las cachés de recursos e imágenes se vacían al pasar de MAX_ENTRADAS_CACHE_PDF
+    entradas, siempre entre renders: WeasyPrint lee los datos de las imágenes de
+    su caché hasta escribir el PDF, así que no se pueden descartar a media página.
+    """
+
+    def __init__(self, hojas_estilo=HOJAS_ESTILO_CV):
+        self.font_config = FontConfiguration()
+        self._recursos = {}
+        self._imagenes = {}
+        self._lock = threading.Lock()
+        self.hojas_estilo = [
+            CSS(filename=self._ruta_estatico(nombre), font_config=self.font_config, url_fetcher=self.url_fetcher)
+            for nombre in hojas_estilo
+        ]
+
+    @staticmethod
+    def _ruta_estatico(nombre):
+        ruta = finders.find(nombre)
+        if ruta is None:
+            raise FileNotFoundError(f'No se encontró el archivo estático {nombre}')
+        return ruta
+
+    def url_fetcher(self, url, timeout=10, ssl_context=None):
+        """default_url_fetcher con caché en memoria de los recursos ya descargados."""
+        recurso = self._recursos.get(url)
+        if recurso is None:
+            resultado = default_url_fetcher(url, timeout=timeout, ssl_context=ssl_context)
+            contenido = resultado.pop('file_obj', None)
+            if contenido is not None:
+                resultado['string'] = contenido.read()
+                contenido.close()
+            recurso = self._recursos[url] = resultado
+        return dict(recurso)
+
+    def _limitar_caches(self):
+        """Vacía las cachés llenas; el worker vive días y cada CV trae su propia foto."""
+        if len(self._recursos) > MAX_ENTRADAS_CACHE_PDF:
+            self._recursos.clear()
+        if len(self._imagenes) > MAX_ENTRADAS_CACHE_PDF:
+            self._imagenes.clear()
+
+    def renderizar(self, html_string, base_url=None):
+        """Convierte el HTML a PDF y devuelve los bytes."""
+        documento = HTML(string=html_string, base_url=base_url, url_fetcher=self.url_fetcher)
+        # FontConfiguration no es segura entre hilos; entre procesos no se comparte nada
+        with self._lock:
+            self._limitar_caches()
+            return documento.write_pdf(
+                stylesheets=self.hojas_estilo,
+                font_config=self.font_config,
+                cache=self._imagenes
+            )
+
+
+_renderizador = None
+_renderizador_lock = threading.Lock()
+
+
+def obtener_renderizador():
+    """RenderizadorPDF del proceso actual, creado en el primer uso."""
+    global _renderizador
+    if _renderizador is None:
+        with _renderizador_lock:
+            if _renderizador is None:
+                _renderizador = RenderizadorPDF()
+    return _renderizador
+
+
+def renderizar_cv_pdf(interesado, curriculum, postulacion=None):
+    """Genera el PDF del CV (o de la instantánea de la postulación) con WeasyPrint y devuelve los bytes."""
+    instantanea = _instantanea(postulacion)
+    if instantanea:
+        contexto = contexto_cv_instantanea(interesado, instantanea)
+    else:
+        contexto = contexto_cv(interesado, curriculum)
+    html_string = render_to_string(PLANTILLA_CV, contexto)
+    return obtener_renderizador().renderizar(html_string)
+
+
+def _guardar_atomico(ruta, contenido):
+    """Escribe en un archivo temporal y lo renombra, así nunca se sirve un PDF a medias."""
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(dir=ruta.parent, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as archivo:
+            archivo.write(contenido)
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+
+def _eliminar_versiones_anteriores(ruta):
+    """Borra los PDF de versiones anteriores del mismo interesado."""
+    for anterior in ruta.parent.glob('*.pdf'):
+        if anterior != ruta:
+            try:
+                anterior.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def obtener_cv_pdf(interesado, curriculum, postulacion=None):
+    """
+    Devuelve la ruta del PDF del CV, generándolo solo si la versión actual no está en caché.
+
+    Con `postulacion` se genera desde su instantánea (lo que el candidato envió);
+    esos PDF no reemplazan a los de otras postulaciones.
+    """
+    ruta = ruta_cv_pdf(interesado, curriculum, postulacion)
+    if not ruta.exists():
+        _guardar_atomico(ruta, renderizar_cv_pdf(interesado, curriculum, postulacion))
+        if not _instantanea(postulacion):
+            _eliminar_versiones_anteriores(ruta)
+    return ruta
+
+
+def cv_pdf_en_cache(interesado, curriculum, postulacion=None):
+    """Ruta del PDF si la versión actual ya está generada; None si no."""
+    ruta = ruta_cv_pdf(interesado, curriculum, postulacion)
+    return ruta if ruta.exists() else None
+
+
+def nombre_archivo_cv(interesado):
+    return f"CV_{interesado.nombre}_{interesado.apellido_paterno}.pdf"
+
+
+def respuesta_cv_pdf(interesado, curriculum, postulacion=None):
+    """FileResponse que transmite el PDF desde la caché en disco."""
+    ruta = obtener_cv_pdf(interesado, curriculum, postulacion)
+    return FileResponse(
+        open(ruta, 'rb'),
+        as_attachment=True,
+        filename=nombre_archivo_cv(interesado),
+        content_type='application/pdf'
+    )
+
+
+# ==============================
+# COLA DE GENERACIÓN EN SEGUNDO PLANO
+# ==============================
+
+def encolar_cv_pdf(interesado, curriculum, postulacion=None):
+    """
+    Registra (o reutiliza) el trabajo que genera la versión actual del CV, o la
+    de la instantánea de `postulacion`.
+
+    Lo procesa el comando `python manage.py procesar_pdfs`; la vista solo devuelve
+    el trabajo para que la página consulte su estado.
+    """
+    version = version_cv(interesado, curriculum, postulacion)
+    try:
+        with transaction.atomic():
+            trabajo, creado = TrabajoPDF.objects.get_or_create(
+                interesado=interesado,
+                version=version,
+                defaults={'postulacion': postulacion if _instantanea(postulacion) else None}
+            )
+    except IntegrityError:
+        # Otra petición creó el mismo trabajo al mismo tiempo
+        trabajo = TrabajoPDF.objects.get(interesado=interesado, version=version)
+
+    # Volver a generarlo si el archivo se borró (limpieza o despliegue) o si el
+    # trabajo agotó sus intentos: pedir el CV otra vez es un reintento explícito
+    reintentar = trabajo.estado == 'error' or (
+        trabajo.estado == 'listo' and not cv_pdf_en_cache(interesado, curriculum, postulacion)
+    )
+    if reintentar:
+        TrabajoPDF.objects.filter(id=trabajo.id, estado=trabajo.estado).update(
+            estado='pendiente', intentos=0, error=None, fecha_actualizacion=timezone.now()
+        )
+        trabajo.estado = 'pendiente'
+        trabajo.intentos = 0
+        trabajo.error = None
+    return trabajo
+
+
+def precalentar_cv_pdf(interesado, curriculum, postulacion=None):
+    """
+    Encola la generación del CV si su versión aún no está en caché.
+
+    Se llama al crear una postulación: cuando el reclutador abre el CV, el PDF
+    normalmente ya está generado y se transmite sin esperar a WeasyPrint.
+    """
+    if cv_pdf_en_cache(interesado, curriculum, postulacion):
+        return None
+    return encolar_cv_pdf(interesado, curriculum, postulacion)
+
+
+def reclamar_trabajos_pdf(limite):
+    """
+    Toma hasta `limite` trabajos pendientes y los marca como "procesando".
+
+    SKIP LOCKED permite correr varios workers sin que dos tomen el mismo trabajo.
+    """
+    with transaction.atomic():
+        ids = list(
+            TrabajoPDF.objects.select_for_update(skip_locked=True)
+            .filter(estado='pendiente')
+            .order_by('fecha_creacion')
+            .values_list('id', flat=True)[:limite]
+        )
+        TrabajoPDF.objects.filter(id__in=ids).update(
+            estado='procesando', intentos=F('intentos') + 1, fecha_actualizacion=timezone.now()
+        )
+    return ids
+
+
+def recuperar_trabajos_abandonados():
+    """Regresa a la cola los trabajos que quedaron "procesando" por un worker caído."""
+    limite = timezone.now() - TIEMPO_MAXIMO_PROCESANDO
+    abandonados = TrabajoPDF.objects.filter(estado='procesando', fecha_actualizacion__lt=limite)
+    ahora = timezone.now()
+    abandonados.filter(intentos__gte=MAX_INTENTOS_PDF).update(
+        estado='error', error='Tiempo de generación excedido', fecha_actualizacion=ahora
+    )
+    return abandonados.update(estado='pendiente', fecha_actualizacion=ahora)
+
+
+def procesar_trabajo_pdf(trabajo_id):
+    """
+    Genera el PDF de un trabajo. Se ejecuta dentro de un proceso del pool del worker.
+
+    Returns:
+        (trabajo_id, mensaje de error o None)
+    """
+    try:
+        trabajo = TrabajoPDF.objects.select_related('postulacion').get(id=trabajo_id)
+        interesado = Interesado.objects.select_related('usuario', 'curriculum').get(id=trabajo.interesado_id)
+        obtener_cv_pdf(interesado, interesado.curriculum, trabajo.postulacion)
+        return trabajo_id, None
+    except Exception as e:
+        return trabajo_id, str(e)
+
+
+def registrar_resultado_pdf(trabajo_id, error):
+    """Marca el trabajo como listo, o lo regresa a la cola / error si falló."""
+    ahora = timezone.now()
+    if error is None:
+        TrabajoPDF.objects.filter(id=trabajo_id).update(estado='listo', error=None, fecha_actualizacion=ahora)
+        return
+
+    trabajo = TrabajoPDF.objects.filter(id=trabajo_id)
+    trabajo.filter(intentos__gte=MAX_INTENTOS_PDF).update(estado='error', error=error, fecha_actualizacion=ahora)
+    trabajo.filter(intentos__lt=MAX_INTENTOS_PDF).update(estado='pendiente', error=error, fecha_actualizacion=ahora)
+
+
+# ==============================
+# DESCARGA MASIVA EN ZIP
+# ==============================
+
+class _BufferZip:
+    """
+    Destino de zipfile que solo acumula lo escrito hasta que se vacía.
+
+    No implementa seek(): zipfile escribe entonces en modo "no buscable" (con
+    descriptores de datos), lo que permite enviar el ZIP mientras se genera.
+    """
+
+    def __init__(self):
+        self._partes = []
+        self._posicion = 0
+
+    def write(self, datos):
+        self._partes.append(bytes(datos))
+        self._posicion += len(datos)
+        return len(datos)
+
+    def tell(self):
+        return self._posicion
+
+    def flush(self):
+        pass
+
+    def vaciar(self):
+        datos = b''.join(self._partes)
+        self._partes.clear()
+        return datos
+
+
+def _agregar_pdf_zip(archivo_zip, buffer, ruta, nombre):
+    """Copia el PDF al ZIP por bloques, entregando los bytes conforme se escriben."""
+    with open(ruta, 'rb') as origen, archivo_zip.open(nombre, 'w') as destino:
+        for bloque in iter(lambda: origen.read(TAMANO_BLOQUE_ZIP), b''):
+            destino.write(bloque)
+            yield buffer.vaciar()
+    yield buffer.vaciar()
+
+
+def _nombre_en_zip(interesado, usados):
+    """Nombre de archivo único dentro del ZIP (dos postulantes pueden llamarse igual)."""
+    nombre = nombre_archivo_cv(interesado)
+    base, extension = os.path.splitext(nombre)
+    contador = 2
+    while nombre in usados:
+        nombre = f'{base}_{contador}{extension}'
+        contador += 1
+    usados.add(nombre)
+    return nombre
+
+
+def zip_cvs_postulantes(postulaciones, espera=ESPERA_ZIP_CV, intervalo=INTERVALO_ZIP_CV):
+    """
+    Generador con los bytes de un ZIP con el CV en PDF de cada postulación, tal
+    como se envió (instantánea). Cada postulación trae interesado__usuario e
+    interesado__curriculum.
+
+    Los PDF que ya están en caché se agregan de inmediato; los faltantes se
+    encolan en TrabajoPDF y se agregan conforme el worker (manage.py procesar_pdfs)
+    los termina, así la descarga no genera PDF en el servidor web y respeta el
+    límite de procesos del worker. En memoria solo vive el bloque que se está
+    enviando, sin importar cuántos postulantes haya. Los que no se pudieron
+    generar, o no estuvieron listos en `espera` segundos, se listan en
+    errores.txt dentro del mismo ZIP.
+    """
+    buffer = _BufferZip()
+    usados = set()
+    errores = []
+    pendientes = {}
+
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as archivo_zip:
+        for postulacion in postulaciones:
+            interesado = postulacion.interesado
+            ruta = cv_pdf_en_cache(interesado, interesado.curriculum, postulacion)
+            if ruta:
+                yield from _agregar_pdf_zip(archivo_zip, buffer, ruta, _nombre_en_zip(interesado, usados))
+            else:
+                pendientes[encolar_cv_pdf(interesado, interesado.curriculum, postulacion).id] = postulacion
+
+        limite = time.monotonic() + espera
+        while pendientes:
+            terminados = TrabajoPDF.objects.filter(
+                id__in=list(pendientes), estado__in=['listo', 'error']
+            ).values_list('id', 'estado', 'error')
+            for trabajo_id, estado, error in terminados:
+                postulacion = pendientes.pop(trabajo_id)
+                interesado = postulacion.interesado
+                ruta = cv_pdf_en_cache(interesado, interesado.curriculum, postulacion)
+                if estado == 'listo' and ruta:
+                    yield from _agregar_pdf_zip(archivo_zip, buffer, ruta, _nombre_en_zip(interesado, usados))
+                else:
+                    errores.append(f'{interesado.nombre} {interesado.apellido_paterno}: {error or "PDF no disponible"}')
+
+            if pendientes and time.monotonic() >= limite:
+                for postulacion in pendientes.values():
+                    interesado = postulacion.interesado
+                    errores.append(f'{interesado.nombre} {interesado.apellido_paterno}: tiempo de espera agotado')
+                break
+            if pendientes:
+                time.sleep(intervalo)
+
+        if errores:
+            archivo_zip.writestr('errores.txt', '\n'.join(errores))
+
+    # El directorio central del ZIP se escribe al cerrarlo
+    yield buffer.vaciar()
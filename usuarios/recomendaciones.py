@@ -0,0 +1,235 @@
+# usuarios/recomendaciones.py
+from collections import Counter
+
+import numpy as np
+from django.db import transaction
+from django.db.models import F, Prefetch, Q
+from django.utils import timezone
+
+from .coincidencia import PESO_NIVEL, terminos, terminos_vacante
+from .models import Curriculum, HabilidadInteresado, Postulacion, Vacante, VacanteRecomendada
+
+# Vacantes guardadas por interesado
+NUM_RECOMENDACIONES = 10
+
+# Currículums por lote: cada lote es una matriz lote x vacantes
+TAMANO_LOTE = 500
+
+# Cuánto pesa una habilidad del CV frente a una palabra de su texto libre
+PESO_HABILIDAD = 2.0
+
+
+def vacantes_publicadas():
+    """Vacantes que se pueden recomendar (las mismas del listado público)."""
+    return Vacante.objects.filter(
+        estado_vacante='publicada',
+        aprobada=True
+    ).select_related('categoria', 'requisitos')
+
+
+def terminos_curriculum(curriculum):
+    """
+    Frecuencia de cada término del CV: resumen, experiencias y estudios, más las
+    habilidades ponderadas por nivel. Usa las relaciones precargadas por
+    curriculums_para_recomendar().
+    """
+    textos = [curriculum.resumen_profesional or '']
+    for experiencia in curriculum.experiencias.all():
+        textos += [experiencia.puesto, experiencia.descripcion]
+    for educacion in curriculum.educaciones.all():
+        textos += [educacion.titulo, educacion.descripcion]
+    frecuencias = Counter(terminos(' '.join(texto for texto in textos if texto)))
+
+    for habilidad in curriculum.habilidades.all():
+        peso = PESO_HABILIDAD * PESO_NIVEL.get(habilidad.nivel, 0.5)
+        for termino in terminos(habilidad.habilidad.nombre):
+            frecuencias[termino] += peso
+    return frecuencias
+
+
+def curriculums_para_recomendar(solo_cambios=False, interesados=None):
+    """
+    Currículums a procesar, con sus secciones precargadas.
+
+    Con `solo_cambios` solo los que cambiaron desde su último cálculo (o que
+    nunca se calcularon): es la corrida incremental entre las nocturnas. El
+    cálculo se registra en Curriculum.fecha_recomendaciones, así un CV sin
+    ninguna vacante afín no se vuelve a procesar en cada corrida.
+    """
+    curriculums = Curriculum.objects.prefetch_related(
+        'experiencias',
+        'educaciones',
+        Prefetch('habilidades', queryset=HabilidadInteresado.objects.select_related('habilidad')),
+    ).order_by('id')
+    if interesados:
+        curriculums = curriculums.filter(interesado_id__in=interesados)
+    if solo_cambios:
+        curriculums = curriculums.filter(
+            Q(fecha_recomendaciones__isnull=True) | Q(fecha_actualizacion__gt=F('fecha_recomendaciones'))
+        )
+    return curriculums
+
+
+class MatrizVacantes:
+    """
+    Matriz TF-IDF (vacantes x vocabulario) de las vacantes publicadas.
+
+    Cada fila es log(1 + tf) * idf normalizada a norma 1; el IDF hace que
+    términos presentes en casi todas las vacantes ("experiencia", "manejo")
+    pesen poco frente a los que distinguen a una vacante ("contabilidad", "python").
+    """
+
+    def __init__(self, vacantes):
+        self.ids = []
+        frecuencias = []
+        for vacante in vacantes:
+            self.ids.append(vacante.id)
+            frecuencias.append(terminos_vacante(vacante))
+        self.ids = np.array(self.ids)
+        self.posicion = {vacante_id: indice for indice, vacante_id in enumerate(self.ids.tolist())}
+
+        documentos = Counter()
+        for terminos_doc in frecuencias:
+            documentos.update(terminos_doc.keys())
+        self.vocabulario = {termino: indice for indice, termino in enumerate(documentos)}
+
+        # IDF suavizado: log((1 + n) / (1 + df)) + 1
+        df = np.fromiter(documentos.values(), dtype=np.float32, count=len(documentos))
+        self.idf = np.log((1 + len(frecuencias)) / (1 + df)) + 1
+        self.matriz = self._matriz(frecuencias)
+
+    def _matriz(self, frecuencias):
+        """Matriz TF-IDF normalizada de una lista de Counter, sobre el vocabulario de las vacantes."""
+        filas, columnas, valores = [], [], []
+        for fila, terminos_doc in enumerate(frecuencias):
+            for termino, frecuencia in terminos_doc.items():
+                columna = self.vocabulario.get(termino)
+                if columna is not None:
+                    filas.append(fila)
+                    columnas.append(columna)
+                    valores.append(frecuencia)
+
+        matriz = np.zeros((len(frecuencias), len(self.vocabulario)), dtype=np.float32)
+        matriz[filas, columnas] = np.log1p(np.array(valores, dtype=np.float32))
+        matriz *= self.idf
+        normas = np.linalg.norm(matriz, axis=1, keepdims=True)
+        normas[normas == 0] = 1
+        return matriz / normas
+
+    def mejores(self, frecuencias, excluir, n=NUM_RECOMENDACIONES):
+        """
+        Las `n` vacantes más afines a cada CV de un lote.
+
+        Args:
+            frecuencias: lista de Counter (terminos_curriculum) del lote
+            excluir: lista paralela de sets de vacante_id (ya postulado)
+
+        Returns:
+            lista paralela de [(vacante_id, puntaje), ...] de mayor a menor puntaje
+        """
+        puntajes = self._matriz(frecuencias) @ self.matriz.T
+
+        # Vacantes a las que cada interesado ya se postuló
+        filas, columnas = [], []
+        for fila, ids in enumerate(excluir):
+            for vacante_id in ids:
+                if vacante_id in self.posicion:
+                    filas.append(fila)
+                    columnas.append(self.posicion[vacante_id])
+        puntajes[filas, columnas] = 0
+
+        n = min(n, puntajes.shape[1])
+        candidatas = np.argpartition(-puntajes, n - 1, axis=1)[:, :n]
+        resultado = []
+        for fila, indices in enumerate(candidatas):
+            indices = indices[np.argsort(-puntajes[fila, indices])]
+            resultado.append([
+                (int(self.ids[indice]), float(puntajes[fila, indice]))
+                for indice in indices if puntajes[fila, indice] > 0
+            ])
+        return resultado
+
+
+def generar_recomendaciones(solo_cambios=False, interesados=None):
+    """
+    Recalcula VacanteRecomendada de los interesados con CV.
+
+    Las vacantes publicadas se vectorizan una sola vez; los currículums se
+    procesan por lotes de TAMANO_LOTE con un producto de matrices por lote.
+    Las recomendaciones de cada lote se reemplazan en una transacción, así el
+    perfil nunca ve una lista a medio escribir. La fecha de cálculo es la del
+    inicio de la corrida: un CV editado mientras corre se vuelve a procesar en
+    la siguiente.
+
+    Returns:
+        (interesados procesados, recomendaciones guardadas)
+    """
+    fecha_calculo = timezone.now()
+    vacantes = MatrizVacantes(vacantes_publicadas().iterator(chunk_size=TAMANO_LOTE))
+    if not len(vacantes.ids):
+        return 0, 0
+
+    procesados = guardadas = 0
+    lote = []
+    for curriculum in curriculums_para_recomendar(solo_cambios, interesados).iterator(chunk_size=TAMANO_LOTE):
+        lote.append(curriculum)
+        if len(lote) >= TAMANO_LOTE:
+            guardadas += _guardar_lote(vacantes, lote, fecha_calculo)
+            procesados += len(lote)
+            lote = []
+    if lote:
+        guardadas += _guardar_lote(vacantes, lote, fecha_calculo)
+        procesados += len(lote)
+    return procesados, guardadas
+
+
+def _guardar_lote(vacantes, curriculums, fecha_calculo):
+    interesados = [curriculum.interesado_id for curriculum in curriculums]
+
+    postuladas = {interesado_id: set() for interesado_id in interesados}
+    for interesado_id, vacante_id in Postulacion.objects.filter(
+        interesado_id__in=interesados
+    ).values_list('interesado_id', 'vacante_id'):
+        postuladas[interesado_id].add(vacante_id)
+
+    mejores = vacantes.mejores(
+        [terminos_curriculum(curriculum) for curriculum in curriculums],
+        [postuladas[interesado_id] for interesado_id in interesados]
+    )
+
+    recomendaciones = [
+        VacanteRecomendada(
+            interesado_id=interesado_id,
+            vacante_id=vacante_id,
+            posicion=posicion,
+            puntaje=round(puntaje, 4),
+            fecha_calculo=fecha_calculo
+        )
+        for interesado_id, sugeridas in zip(interesados, mejores)
+        for posicion, (vacante_id, puntaje) in enumerate(sugeridas, start=1)
+    ]
+    with transaction.atomic():
+        VacanteRecomendada.objects.filter(interesado_id__in=interesados).delete()
+        VacanteRecomendada.objects.bulk_create(recomendaciones)
+        # update() no toca Curriculum.fecha_actualizacion (auto_now)
+        Curriculum.objects.filter(
+            id__in=[curriculum.id for curriculum in curriculums]
+        ).update(fecha_recomendaciones=fecha_calculo)
+    return len(recomendaciones)
+
+
+def vacantes_recomendadas(interesado):
+    """
+    Recomendaciones vigentes de un interesado: una consulta por el índice
+    (interesado, posicion). Omite las vacantes que ya no están publicadas y
+    aquellas a las que se postuló después del último cálculo.
+    """
+    return VacanteRecomendada.objects.filter(
+        interesado=interesado,
+        vacante__estado_vacante='publicada',
+        vacante__aprobada=True
+    ).exclude(
+        vacante__postulaciones__interesado=interesado
+    ).select_related(
+        'vacante__secretaria', 'vacante__categoria'
+    ).order_by('posicion')
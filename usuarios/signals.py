@@ -1,10 +1,20 @@
 # usuarios/signals.py
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_init, post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from django.core.mail import send_mail
 from django.conf import settings
-from .models import Interesado, Reclutador
+from django.utils import timezone
+from .models import (
+    Interesado, Reclutador, Vacante, RequisitoVacante, Categoria, Secretaria,
+    Curriculum, ExperienciaLaboral, Educacion, HabilidadInteresado, IdiomaInteresado,
+    Postulacion, PostulacionEvento
+)
+from .busqueda import actualizar_vector_busqueda
+from .cache_busqueda import invalidar_busquedas
 
 Usuario = get_user_model()
 
@@ -38,4 +48,158 @@ def notificar_nueva_solicitud_reclutador(sender, instance, created, **kwargs):
                 send_mail(subject, message, from_email, admin_emails, fail_silently=True)
         except Exception as e:
             # Log error, no interrumpir el flujo
-            print(f"Error enviando notificación: {e}")
\ No newline at end of file
+            print(f"Error enviando notificación: {e}")
+
+# ==============================
+# ÍNDICE DE BÚSQUEDA DE VACANTES
+# ==============================
+
+@receiver(post_save, sender=Vacante)
+def actualizar_busqueda_vacante(sender, instance, **kwargs):
+    """Mantiene actualizado el search_vector cuando se guarda una vacante."""
+    actualizar_vector_busqueda([instance.id])
+
+
+@receiver(post_save, sender=RequisitoVacante)
+@receiver(post_delete, sender=RequisitoVacante)
+def actualizar_busqueda_requisitos(sender, instance, **kwargs):
+    """
+    Los requisitos forman parte del vector de búsqueda de su vacante: al borrarlos
+    se quita su texto del índice.
+    """
+    actualizar_vector_busqueda([instance.vacante_id])
+
+
+@receiver(post_save, sender=Categoria)
+@receiver(post_save, sender=Secretaria)
+def actualizar_busqueda_relacionadas(sender, instance, created, **kwargs):
+    """Recalcula las vacantes afectadas si cambia el nombre de su categoría o secretaría."""
+    if not created:
+        actualizar_vector_busqueda(instance.vacantes.values_list('id', flat=True))
+
+
+@receiver(post_save, sender=Vacante)
+@receiver(post_delete, sender=Vacante)
+@receiver(post_save, sender=RequisitoVacante)
+@receiver(post_delete, sender=RequisitoVacante)
+@receiver(post_save, sender=Categoria)
+@receiver(post_save, sender=Secretaria)
+def invalidar_cache_busquedas(sender, **kwargs):
+    """
+    Cualquier cambio en una vacante (guardar, aprobar, publicar, cerrar, eliminar) o en
+    los datos que se buscan invalida la caché de resultados.
+
+    Se espera al commit para que ninguna petición guarde en la nueva generación
+    datos que todavía no son visibles.
+    """
+    transaction.on_commit(invalidar_busquedas)
+
+
+# ==============================
+# PUNTAJES DE COINCIDENCIA
+# ==============================
+
+@receiver(post_save, sender=Vacante)
+@receiver(post_save, sender=RequisitoVacante)
+def invalidar_puntajes_vacante(sender, instance, **kwargs):
+    """
+    Los puntajes de coincidencia dependen del texto y requisitos de la vacante:
+    se marcan como pendientes y se recalculan en un solo paso la próxima vez que
+    el reclutador ordene por coincidencia (usuarios/coincidencia.py).
+    """
+    vacante_id = instance.id if sender is Vacante else instance.vacante_id
+    Postulacion.objects.filter(
+        vacante_id=vacante_id,
+        puntaje_coincidencia__isnull=False
+    ).update(puntaje_coincidencia=None)
+
+
+@receiver(post_save, sender=Categoria)
+def invalidar_puntajes_categoria(sender, instance, created, **kwargs):
+    """El nombre de la categoría forma parte del perfil de sus vacantes."""
+    if not created:
+        Postulacion.objects.filter(
+            vacante__categoria=instance,
+            puntaje_coincidencia__isnull=False
+        ).update(puntaje_coincidencia=None)
+
+
+# ==============================
+# VERSIÓN DEL CV (CACHÉ DE PDF)
+# ==============================
+
+@receiver(post_save, sender=ExperienciaLaboral)
+@receiver(post_delete, sender=ExperienciaLaboral)
+@receiver(post_save, sender=Educacion)
+@receiver(post_delete, sender=Educacion)
+@receiver(post_save, sender=HabilidadInteresado)
+@receiver(post_delete, sender=HabilidadInteresado)
+@receiver(post_save, sender=IdiomaInteresado)
+@receiver(post_delete, sender=IdiomaInteresado)
+def actualizar_version_curriculum(sender, instance, **kwargs):
+    """
+    Cualquier cambio en las secciones del CV actualiza Curriculum.fecha_actualizacion,
+    que es la versión con la que se guarda el PDF en caché (usuarios/pdf.py).
+    """
+    Curriculum.objects.filter(id=instance.curriculum_id).update(fecha_actualizacion=timezone.now())
+
+
+# ==============================
+# CONTADORES DE POSTULACIONES
+# ==============================
+
+def _sumar(campo):
+    return F(campo) + 1
+
+
+def _restar(campo):
+    # Nunca por debajo de cero aunque el contador se haya desfasado
+    return Greatest(F(campo) - 1, 0)
+
+
+@receiver(post_init, sender=Postulacion)
+def recordar_estado_postulacion(sender, instance, **kwargs):
+    """Guarda el estado con el que se cargó la postulación para detectar cambios."""
+    # __dict__ evita una consulta extra si 'estado' se difirió con only()/defer()
+    instance._estado_original = instance.__dict__.get('estado')
+
+
+@receiver(post_save, sender=Postulacion)
+def actualizar_contadores_postulacion(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Mantiene Vacante.num_postulaciones y los contadores por estado, y registra
+    el cambio en PostulacionEvento.
+
+    Se ejecuta en la transacción de quien guarda la postulación: las vistas que
+    crean o cambian postulaciones lo hacen dentro de transaction.atomic(). Los
+    cambios masivos con bulk_update hacen lo mismo por su cuenta (ver
+    actualizar_postulaciones_lote).
+    """
+    contadores = Vacante.CONTADORES_ESTADO
+    cambios = {}
+    evento = None
+    if created:
+        cambios['num_postulaciones'] = _sumar('num_postulaciones')
+        cambios[contadores[instance.estado]] = _sumar(contadores[instance.estado])
+        evento = PostulacionEvento.desde_postulacion(instance, fecha=instance.fecha_postulacion)
+    elif (update_fields is None or 'estado' in update_fields) and \
+            instance._estado_original and instance._estado_original != instance.estado:
+        cambios[contadores[instance._estado_original]] = _restar(contadores[instance._estado_original])
+        cambios[contadores[instance.estado]] = _sumar(contadores[instance.estado])
+        evento = PostulacionEvento.desde_postulacion(instance, instance._estado_original)
+
+    if cambios:
+        Vacante.objects.filter(id=instance.vacante_id).update(**cambios)
+    if evento:
+        evento.save()
+    instance._estado_original = instance.estado
+
+
+@receiver(post_delete, sender=Postulacion)
+def descontar_postulacion(sender, instance, **kwargs):
+    """Resta la postulación eliminada (también en borrados en cascada) de su vacante."""
+    campo_estado = Vacante.CONTADORES_ESTADO[instance.estado]
+    Vacante.objects.filter(id=instance.vacante_id).update(
+        num_postulaciones=_restar('num_postulaciones'),
+        **{campo_estado: _restar(campo_estado)}
+    )
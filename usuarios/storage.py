@@ -0,0 +1,58 @@
+# usuarios/storage.py
+import hashlib
+import os
+import re
+
+from django.core.files.storage import FileSystemStorage, storages
+
+# Nombre de un archivo guardado por contenido: sha256 en hexadecimal + extensión
+PATRON_NOMBRE_CONTENIDO = re.compile(r'(^|/)[0-9a-f]{64}\.[a-z0-9]+$')
+
+
+class AlmacenamientoContenido(FileSystemStorage):
+    """
+    Storage que nombra cada archivo por el sha256 de su contenido.
+
+    "interesados/perfil.jpg" se guarda como "interesados/<sha256>.jpg": dos
+    subidas idénticas comparten un solo archivo y, como un nombre nunca cambia
+    de contenido, se puede servir con Cache-Control immutable.
+
+    Un archivo puede estar referenciado por varios registros, así que nunca se
+    borra al reemplazar una foto; los que ya nadie usa los elimina el comando
+    `python manage.py limpiar_medios`.
+    """
+
+    def __init__(self, **kwargs):
+        # Reescribir un nombre existente es inofensivo: el contenido es el mismo
+        kwargs.setdefault('allow_overwrite', True)
+        super().__init__(**kwargs)
+
+    @staticmethod
+    def nombre_por_contenido(name, content):
+        """Mismo directorio y extensión que `name`, con el hash del contenido como nombre."""
+        resumen = hashlib.sha256()
+        for bloque in content.chunks():
+            resumen.update(bloque)
+        content.seek(0)
+
+        directorio = os.path.dirname(name)
+        extension = os.path.splitext(name)[1].lower()
+        if extension == '.jpeg':
+            extension = '.jpg'
+        return os.path.join(directorio, f'{resumen.hexdigest()}{extension}')
+
+    def _save(self, name, content):
+        nombre = self.nombre_por_contenido(name, content)
+        if self.exists(nombre):
+            return nombre
+        return super()._save(nombre, content)
+
+
+def es_nombre_contenido(nombre):
+    """True si el archivo fue nombrado por su contenido (y por lo tanto es inmutable)."""
+    return bool(PATRON_NOMBRE_CONTENIDO.search(nombre))
+
+
+def almacenamiento_contenido():
+    """Storage de fotos y logos (alias 'contenido' de settings.STORAGES)."""
+    return storages['contenido']
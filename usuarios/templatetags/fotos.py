@@ -0,0 +1,59 @@
+# usuarios/templatetags/fotos.py
+from django import template
+from django.utils.html import format_html
+
+from usuarios.storage import almacenamiento_contenido
+
+register = template.Library()
+
+
+def _srcset(derivados, extension):
+    """srcset con un candidato por ancho distinto ('url 96w, url 320w, ...')."""
+    candidatos = {}
+    for derivado in derivados.values():
+        if derivado.get(extension):
+            candidatos[derivado['ancho']] = almacenamiento_contenido().url(derivado[extension])
+    return ', '.join(f'{url} {ancho}w' for ancho, url in sorted(candidatos.items()))
+
+
+@register.simple_tag
+def foto_perfil(interesado, tamano='avatar', sizes='40px', clase='', alt=''):
+    """
+    <picture> de la foto de perfil con WebP, JPEG de respaldo y srcset.
+
+    `sizes` es el ancho con que se muestra la foto; el navegador elige el derivado
+    adecuado para la densidad de la pantalla. Mientras los derivados se generan
+    (usuarios/imagenes.py) se muestra la foto original.
+
+    Uso: {% foto_perfil interesado 'avatar' sizes='40px' clase='profile-photo' alt='Foto' %}
+    """
+    if not interesado.foto_perfil:
+        return ''
+
+    derivados = interesado.foto_derivados or {}
+    if tamano not in derivados:
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="lazy">',
+            interesado.foto_perfil.url, alt, clase
+        )
+
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" alt="{}" class="{}" loading="lazy">'
+        '</picture>',
+        _srcset(derivados, 'webp'), sizes,
+        almacenamiento_contenido().url(derivados[tamano]['jpg']), _srcset(derivados, 'jpg'), sizes,
+        alt, clase
+    )
+
+
+@register.simple_tag
+def foto_url(interesado, tamano='tarjeta'):
+    """URL del JPEG de un tamaño (o de la original si aún no hay derivados), para <img> manejados por JS."""
+    if not interesado.foto_perfil:
+        return ''
+    derivado = (interesado.foto_derivados or {}).get(tamano)
+    if derivado and derivado.get('jpg'):
+        return almacenamiento_contenido().url(derivado['jpg'])
+    return interesado.foto_perfil.url
@@ -1,3 +1,350 @@
-from django.test import TestCase
+# usuarios/tests.py
+import threading
+from datetime import date, timedelta
 
-# Create your tests here.
+from django.db import connection
+from django.test import Client, SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .busqueda import consulta_busqueda
+from .coincidencia import PerfilVacante
+from .recomendaciones import curriculums_para_recomendar, generar_recomendaciones
+from .models import Categoria, Curriculum, Postulacion, Reclutador, RequisitoVacante, Secretaria, Usuario, Vacante
+
+
+# ==============================
+# DATOS DE PRUEBA
+# ==============================
+
+def crear_vacante(**campos):
+    """Vacante publicada y aprobada con su reclutador, secretaría y categoría."""
+    secretaria = Secretaria.objects.create(nombre='Secretaría de Pruebas', rfc=f'RFC{Secretaria.objects.count():010d}')
+    usuario = Usuario.objects.create_user(
+        email=f'reclutador{Usuario.objects.count()}@pruebas.mx', password='clave', rol='reclutador'
+    )
+    reclutador = Reclutador.objects.create(
+        usuario=usuario, secretaria=secretaria, nombre='Ana', apellido_paterno='Reyes', aprobado=True
+    )
+    valores = {
+        'secretaria': secretaria,
+        'reclutador': reclutador,
+        'titulo': 'Desarrollador Python',
+        'descripcion': 'Desarrollo de APIs con Django y PostgreSQL',
+        'categoria': Categoria.objects.create(nombre='Tecnología'),
+        'tipo_empleo': 'tiempo_completo',
+        'municipio': 'toluca',
+        'fecha_limite': date.today() + timedelta(days=30),
+        'estado_vacante': 'publicada',
+        'aprobada': True,
+    }
+    valores.update(campos)
+    return Vacante.objects.create(**valores)
+
+
+def crear_interesado(numero):
+    """Interesado con nombre y CV, listo para postularse."""
+    usuario = Usuario.objects.create_user(email=f'interesado{numero}@pruebas.mx', password='clave')
+    interesado = usuario.interesado  # creado por usuarios/signals.py
+    interesado.nombre = f'Candidato{numero}'
+    interesado.apellido_paterno = 'Prueba'
+    interesado.save()
+    Curriculum.objects.create(interesado=interesado, resumen_profesional='Programador Python')
+    return interesado
+
+
+def crear_postulacion(vacante, numero):
+    """Postulación con la instantánea del CV que muestra la lista de postulantes."""
+    interesado = crear_interesado(numero)
+    return Postulacion.objects.create(
+        interesado=interesado,
+        vacante=vacante,
+        curriculum=interesado.curriculum,
+        cv_instantanea={
+            'resumen_profesional': 'Programador Python',
+            'habilidades': [
+                {'id': 1, 'nombre': 'Python', 'nivel': 'experto', 'nivel_display': 'Experto'},
+                {'id': 2, 'nombre': 'Django', 'nivel': 'avanzado', 'nivel_display': 'Avanzado'},
+            ],
+        }
+    )
+
+
+# ==============================
+# ÍNDICE DE BÚSQUEDA
+# ==============================
+
+class VectorBusquedaTests(TestCase):
+    """El search_vector de la vacante sigue a sus requisitos."""
+
+    def test_borrar_requisitos_los_quita_del_indice(self):
+        vacante = crear_vacante()
+        requisitos = RequisitoVacante.objects.create(vacante=vacante, descripcion_requisitos='Kubernetes')
+        coincide = Vacante.objects.filter(id=vacante.id, search_vector=consulta_busqueda('kubernetes'))
+        self.assertTrue(coincide.exists())
+
+        requisitos.delete()
+        self.assertFalse(coincide.exists())
+
+
+# ==============================
+# CONSULTAS DE LA LISTA DE POSTULANTES
+# ==============================
+
+class ListaPostulantesConsultasTests(TestCase):
+    """El número de consultas de la lista de postulantes no crece con los postulantes."""
+
+    def setUp(self):
+        self.vacante = crear_vacante()
+        self.cliente = Client()
+        self.cliente.force_login(self.vacante.reclutador.usuario)
+
+    def _verificar_consultas_constantes(self, url):
+        crear_postulacion(self.vacante, 0)
+        # Primera petición: llena cachés de proceso (ContentType, plantillas)
+        self.assertEqual(self.cliente.get(url).status_code, 200)
+
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = self.cliente.get(url)
+        self.assertEqual(respuesta.status_code, 200)
+
+        for numero in range(1, 30):
+            crear_postulacion(self.vacante, numero)
+        with self.assertNumQueries(len(consultas)):
+            respuesta = self.cliente.get(url)
+        self.assertEqual(respuesta.status_code, 200)
+
+    def test_ver_postulantes(self):
+        self._verificar_consultas_constantes(reverse('ver_postulantes', args=[self.vacante.id]))
+
+    def test_postulantes_vacante_ajax(self):
+        self._verificar_consultas_constantes(reverse('postulantes_vacante_ajax', args=[self.vacante.id]))
+
+
+class ActualizarPostulacionesLoteTests(TestCase):
+    """Validación del cuerpo JSON de las acciones masivas."""
+
+    def setUp(self):
+        self.vacante = crear_vacante()
+        self.cliente = Client()
+        self.cliente.force_login(self.vacante.reclutador.usuario)
+        self.url = reverse('actualizar_postulaciones_lote')
+
+    def test_cuerpo_que_no_es_objeto(self):
+        for cuerpo in ('[1, 2]', '"enviada"', '3'):
+            respuesta = self.cliente.post(self.url, cuerpo, content_type='application/json')
+            self.assertEqual(respuesta.status_code, 400)
+            self.assertEqual(respuesta.json(), {'success': False, 'error': 'Datos JSON inválidos'})
+
+    def test_cambio_de_estado_en_lote(self):
+        postulaciones = [crear_postulacion(self.vacante, numero) for numero in range(3)]
+        respuesta = self.cliente.post(self.url, {
+            'postulacion_ids': [postulacion.id for postulacion in postulaciones],
+            'nuevo_estado': 'en_revision',
+        }, content_type='application/json')
+
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.json()['actualizadas'], 3)
+        self.assertEqual(respuesta.json()['estadisticas']['en_revision'], 3)
+        self.assertEqual(Postulacion.objects.filter(vacante=self.vacante, estado='en_revision').count(), 3)
+
+
+# ==============================
+# PUNTAJE DE COINCIDENCIA
+# ==============================
+
+class PerfilVacanteTests(SimpleTestCase):
+    """Puntaje de coincidencia con instancias sin guardar: no consulta la base de datos."""
+
+    HOY = date(2025, 6, 1)
+
+    def setUp(self):
+        self.vacante = Vacante(
+            titulo='Desarrollador Python',
+            descripcion='Desarrollo de APIs REST con Django y PostgreSQL',
+            categoria=Categoria(nombre='Tecnología'),
+        )
+        RequisitoVacante(
+            vacante=self.vacante,
+            educacion_minima='Licenciatura en informática',
+            experiencia_minima='2 años',
+            descripcion_requisitos='Python, Django, PostgreSQL y Docker',
+        )
+        self.cv_afin = {
+            'resumen_profesional': 'Desarrollador backend con Python y Django',
+            'experiencias': [{
+                'puesto': 'Desarrollador Python',
+                'descripcion': 'APIs REST con Django y PostgreSQL',
+                'fecha_inicio': '2020-01-01',
+                'fecha_fin': None,
+                'actual': True,
+            }],
+            'educaciones': [{'titulo': 'Licenciatura en Informática', 'descripcion': ''}],
+            'habilidades': [
+                {'nombre': 'Python', 'nivel': 'experto'},
+                {'nombre': 'Django', 'nivel': 'avanzado'},
+                {'nombre': 'PostgreSQL', 'nivel': 'intermedio'},
+                {'nombre': 'Docker', 'nivel': 'basico'},
+            ],
+        }
+        self.cv_ajeno = {
+            'resumen_profesional': 'Contador con experiencia en nóminas',
+            'experiencias': [{
+                'puesto': 'Auxiliar contable',
+                'descripcion': 'Conciliaciones bancarias',
+                'fecha_inicio': '2024-01-01',
+                'fecha_fin': '2024-06-01',
+                'actual': False,
+            }],
+            'educaciones': [{'titulo': 'Bachillerato', 'descripcion': ''}],
+            'habilidades': [{'nombre': 'Excel', 'nivel': 'experto'}],
+        }
+
+    def test_cv_que_cubre_los_requisitos_queda_primero(self):
+        afin, ajeno = PerfilVacante(self.vacante).puntuar([self.cv_afin, self.cv_ajeno], hoy=self.HOY)
+        self.assertGreater(afin, ajeno)
+
+    def test_puntajes_entre_0_y_100(self):
+        puntajes = PerfilVacante(self.vacante).puntuar([self.cv_afin, self.cv_ajeno, {}], hoy=self.HOY)
+        self.assertTrue(((puntajes >= 0) & (puntajes <= 100)).all())
+
+    def test_instantanea_vacia(self):
+        puntajes = PerfilVacante(self.vacante).puntuar([{}], hoy=self.HOY)
+        self.assertEqual(len(puntajes), 1)
+        self.assertEqual(puntajes[0], 0)
+
+    def test_sin_postulantes(self):
+        self.assertEqual(len(PerfilVacante(self.vacante).puntuar([])), 0)
+
+    def test_vacante_sin_requisitos(self):
+        vacante = Vacante(
+            titulo='Desarrollador Python',
+            descripcion='Desarrollo de APIs REST con Django',
+            categoria=Categoria(nombre='Tecnología'),
+        )
+        perfil = PerfilVacante(vacante)
+        self.assertEqual(perfil.anios_minimos, 0)
+        self.assertEqual(perfil.estudio_minimo, 0)
+
+        afin, ajeno, vacia = perfil.puntuar([self.cv_afin, self.cv_ajeno, {}], hoy=self.HOY)
+        self.assertGreater(afin, ajeno)
+        self.assertTrue(0 <= vacia <= afin <= 100)
+
+
+# ==============================
+# RECOMENDACIONES
+# ==============================
+
+class RecomendacionesIncrementalesTests(TestCase):
+    """La corrida con solo_cambios no repite CV ya calculados, aunque no tengan recomendaciones."""
+
+    def setUp(self):
+        crear_vacante()
+        self.afin = crear_interesado(1)
+        self.afin.curriculum.resumen_profesional = 'Desarrollador Python con Django y PostgreSQL'
+        self.afin.curriculum.save()
+        self.sin_afinidad = crear_interesado(2)
+        self.sin_afinidad.curriculum.resumen_profesional = 'Repostería y panadería artesanal'
+        self.sin_afinidad.curriculum.save()
+
+    def test_cv_sin_recomendaciones_no_se_reprocesa(self):
+        self.assertEqual(generar_recomendaciones(solo_cambios=True)[0], 2)
+        self.assertTrue(self.afin.vacantes_recomendadas.exists())
+        self.assertFalse(self.sin_afinidad.vacantes_recomendadas.exists())
+
+        self.assertFalse(curriculums_para_recomendar(solo_cambios=True).exists())
+        self.assertEqual(generar_recomendaciones(solo_cambios=True), (0, 0))
+
+    def test_cv_editado_se_vuelve_a_procesar(self):
+        generar_recomendaciones()
+        self.sin_afinidad.curriculum.resumen_profesional = 'Programador Python'
+        self.sin_afinidad.curriculum.save()
+
+        self.assertEqual(
+            list(curriculums_para_recomendar(solo_cambios=True).values_list('interesado_id', flat=True)),
+            [self.sin_afinidad.id]
+        )
+
+
+# ==============================
+# POSTULACIONES CONCURRENTES
+# ==============================
+
+class PostulacionConcurrenteTests(TransactionTestCase):
+    """
+    El límite de postulantes se respeta con peticiones simultáneas (la vacante se
+    bloquea con select_for_update en postularse_vacante). Requiere PostgreSQL:
+    TransactionTestCase confirma cada transacción y los hilos usan conexiones propias.
+    """
+
+    NUM_HILOS = 12
+
+    def _postular_en_paralelo(self, clientes, vacante):
+        """Envía una postulación por cliente, todas a la vez; devuelve las respuestas."""
+        url = reverse('postularse_vacante', args=[vacante.id])
+        barrera = threading.Barrier(len(clientes))
+        respuestas = [None] * len(clientes)
+
+        def postular(indice, cliente):
+            try:
+                barrera.wait()
+                respuestas[indice] = cliente.post(url, {'mensaje_motivacion': 'Me interesa'})
+            finally:
+                connection.close()
+
+        hilos = [
+            threading.Thread(target=postular, args=(indice, cliente))
+            for indice, cliente in enumerate(clientes)
+        ]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        return respuestas
+
+    def _cliente(self, interesado):
+        cliente = Client()
+        cliente.force_login(interesado.usuario)
+        return cliente
+
+    def test_limite_de_postulantes_con_peticiones_simultaneas(self):
+        vacante = crear_vacante(max_postulantes=5)
+        interesados = [crear_interesado(numero) for numero in range(self.NUM_HILOS)]
+
+        respuestas = self._postular_en_paralelo([self._cliente(i) for i in interesados], vacante)
+
+        self.assertTrue(all(respuesta.status_code == 200 for respuesta in respuestas))
+        exitosas = [respuesta for respuesta in respuestas if respuesta.json()['success']]
+        self.assertEqual(len(exitosas), 5)
+        for respuesta in respuestas:
+            if not respuesta.json()['success']:
+                self.assertEqual(
+                    respuesta.json()['error'], 'Esta vacante ya alcanzó el límite máximo de postulantes'
+                )
+
+        self.assertEqual(Postulacion.objects.filter(vacante=vacante).count(), 5)
+        vacante.refresh_from_db()
+        self.assertEqual(vacante.num_postulaciones, 5)
+
+        # Una segunda postulación del mismo interesado es un error controlado, no un 500
+        postulado = Postulacion.objects.filter(vacante=vacante).first().interesado
+        respuesta = self._cliente(postulado).post(reverse('postularse_vacante', args=[vacante.id]))
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.json(), {'success': False, 'error': 'Ya te has postulado a esta vacante'})
+
+    def test_doble_envio_simultaneo_del_mismo_interesado(self):
+        vacante = crear_vacante(max_postulantes=20)
+        interesado = crear_interesado(1)
+
+        respuestas = self._postular_en_paralelo([self._cliente(interesado) for _ in range(4)], vacante)
+
+        self.assertTrue(all(respuesta.status_code == 200 for respuesta in respuestas))
+        datos = [respuesta.json() for respuesta in respuestas]
+        self.assertEqual(sum(1 for dato in datos if dato['success']), 1)
+        for dato in datos:
+            if not dato['success']:
+                self.assertEqual(dato['error'], 'Ya te has postulado a esta vacante')
+
+        self.assertEqual(Postulacion.objects.filter(vacante=vacante, interesado=interesado).count(), 1)
+        vacante.refresh_from_db()
+        self.assertEqual(vacante.num_postulaciones, 1)
@@ -34,6 +34,7 @@ urlpatterns = [
     path('editar-vacante/<int:vacante_id>/', views.EditarVacanteView.as_view(), name='editar_vacante'),
     path('mis-vacantes/', views.MisVacantesView.as_view(), name='mis_vacantes'),
     path('vacante/<int:vacante_id>/postulantes/', views.VerPostulantesView.as_view(), name='ver_postulantes'),
+    path('vacante/<int:vacante_id>/postulantes/cvs/', views.descargar_cvs_vacante, name='descargar_cvs_vacante'),
     path('candidato/<int:interesado_id>/perfil/', views.ver_perfil_candidato, name='ver_perfil_candidato'),
 
     # ===========================
@@ -56,6 +57,7 @@ urlpatterns = [
     # path('cv/descargar-pdf/', views.descargar_cv_pdf, name='descargar_cv_pdf'),
     path('cv/descargar/', views.descargar_cv_pdf, name='descargar_cv_pdf'),
     path('cv/descarga/', views.descargar_cv_pdf_reclutador, name='descargar_cv_pdf_reclutador'),
+    path('cv/estado/<int:trabajo_id>/', views.estado_cv_pdf, name='estado_cv_pdf'),
     # descargar_cv_pdf_reclutador
     # path('cv/descargar/', views.descargar_cv_pdf, name='descargar_cv_pdf'),
 
@@ -100,7 +102,12 @@ urlpatterns = [
          name='cambiar_estado_postulacion'),
     path('ajax/agregar-notas-postulacion/<int:postulacion_id>/', views.agregar_notas_postulacion,
          name='agregar_notas_postulacion'),
+    path('ajax/vacante/<int:vacante_id>/postulantes/', views.postulantes_vacante_ajax,
+         name='postulantes_vacante_ajax'),
+    path('ajax/postulaciones/lote/', views.actualizar_postulaciones_lote,
+         name='actualizar_postulaciones_lote'),
     path('ajax/buscar-vacantes/', views.busqueda_vacantes_ajax, name='busqueda_vacantes_ajax'),
+    path('ajax/autocompletar/', views.autocompletar_vacantes, name='autocompletar_vacantes'),
 
     # ===========================
     # URL DE PRUEBA (TEMPORAL)
@@ -2,30 +2,26 @@
 
 # Importaciones de Django core
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
+from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.generic import View
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
-from django.db import transaction
-from django.db.models import Count, Q
-from django.http import JsonResponse, HttpResponse, Http404
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Exists, OuterRef, Q, Sum, Value
+from django.db.models.functions import Coalesce, Concat, Lower
+from django.http import JsonResponse, Http404, StreamingHttpResponse
+from django.views.static import serve
 from django.template.loader import render_to_string
 from django.forms import modelformset_factory
-from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
-from django.core.paginator import Paginator
-from datetime import date
 # Importaciones para manejo de archivos e imágenes
-from weasyprint import HTML
-from io import BytesIO
-from PIL import Image
-import io
+import logging
 import os
-import uuid
 
 # Importaciones de modelos locales - ORGANIZADAS Y COMPLETAS
 from .models import (
@@ -47,7 +43,11 @@ from .models import (
     Vacante,
     RequisitoVacante,
     Categoria,
-    Postulacion
+    Postulacion,
+    PostulacionEvento,
+
+    # Cola de generación de PDF
+    TrabajoPDF
 )
 
 # Importaciones de formularios locales
@@ -66,6 +66,23 @@ from .forms import (
     IdiomaInteresadoForm
 )
 
+# Búsqueda de texto completo (PostgreSQL), paginación por cursor y caché de resultados
+from .busqueda import buscar_vacantes_texto, calcular_facetas, municipios_similares
+from .cache_busqueda import contar_cacheado, pagina_cacheada, resultado_cacheado
+from .paginacion import PaginadorCursor
+from .autocompletado import sugerencias
+from .imagenes import guardar_foto_perfil, validar_imagen, ImagenNoValida
+from .storage import es_nombre_contenido
+from .coincidencia import calcular_puntajes
+from .instantaneas import contexto_instantanea, instantanea_cv
+from .recomendaciones import vacantes_recomendadas
+from .estadisticas import ajustar_contadores_estado, anotar_nuevos_hoy, estadisticas_de, estadisticas_vacante
+
+# Generación de CV en PDF con caché en disco
+from .pdf import respuesta_cv_pdf, cv_pdf_en_cache, encolar_cv_pdf, precalentar_cv_pdf, zip_cvs_postulantes
+
+logger = logging.getLogger(__name__)
+
 
 # =========================================
 # VISTAS AJAX PARA HABILIDADES - CORREGIDAS
@@ -414,12 +431,23 @@ def actualizar_perfil_ajax(request):
                     'error': 'El archivo es demasiado grande. Máximo 5MB'
                 })
 
-            # Para imágenes ya recortadas (blob), no necesitan procesamiento adicional
-            # Ya vienen en el tamaño correcto de 160x160px
-            interesado.foto_perfil = foto
+            # Validar formato y resolución sin decodificar la imagen
+            try:
+                validar_imagen(foto)
+            except ImagenNoValida as e:
+                return JsonResponse({
+                    'success': False,
+                    'error': str(e)
+                })
 
         interesado.save()
 
+        if 'foto_perfil' in request.FILES:
+            # Las imágenes recortadas (blob) se guardan tal cual; los derivados
+            # para srcset se generan en segundo plano
+            extension = os.path.splitext(foto.name)[1].lower() or '.jpg'
+            guardar_foto_perfil(interesado, foto, f"perfil{extension}")
+
         return JsonResponse({
             'success': True,
             'message': 'Perfil actualizado exitosamente' if not only_photo else 'Imagen guardada exitosamente',
@@ -477,40 +505,21 @@ def actualizar_foto_perfil_ajax(request):
                 'error': 'La imagen no debe superar los 5MB'
             }, status=400)
 
-        # Procesar la imagen
+        # Verificar formato y resolución (solo lee el encabezado, no decodifica)
         try:
-            # Abrir la imagen con PIL para procesarla
-            image = Image.open(foto_file)
-
-            # Convertir a RGB si es necesario (para JPEGs)
-            if image.mode in ('RGBA', 'P'):
-                image = image.convert('RGB')
-
-            # Redimensionar si es muy grande (máximo 800x800 antes de guardar)
-            max_size = (800, 800)
-            image.thumbnail(max_size, Image.Resampling.LANCZOS)
-
-            # Guardar la imagen procesada en memoria
-            output = io.BytesIO()
-            image.save(output, format='JPEG', quality=85, optimize=True)
-            output.seek(0)
-
-            # Generar nombre único para el archivo
-            filename = f"perfil_{interesado.id}_{uuid.uuid4().hex[:8]}.jpg"
-
-            # Eliminar foto anterior si existe
-            if interesado.foto_perfil:
-                try:
-                    # Eliminar archivo físico anterior
-                    if default_storage.exists(interesado.foto_perfil.name):
-                        default_storage.delete(interesado.foto_perfil.name)
-                except Exception as e:
-                    # Log el error pero continúa (no es crítico)
-                    print(f"Error al eliminar foto anterior: {e}")
-
-            # Guardar nueva foto
-            foto_content = ContentFile(output.getvalue(), name=filename)
-            interesado.foto_perfil.save(filename, foto_content, save=True)
+            validar_imagen(foto_file)
+        except ImagenNoValida as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            }, status=400)
+
+        try:
+            # El storage nombra el archivo por su contenido; solo importa la extensión
+            extension = os.path.splitext(foto_file.name)[1].lower() or '.jpg'
+
+            # Guardar la original; las versiones reducidas se generan en segundo plano
+            guardar_foto_perfil(interesado, foto_file, f"perfil{extension}")
 
             # Construir URL completa de la foto
             foto_url = request.build_absolute_uri(interesado.foto_perfil.url)
@@ -519,7 +528,7 @@ def actualizar_foto_perfil_ajax(request):
                 'success': True,
                 'message': 'Foto de perfil actualizada correctamente',
                 'photo_url': foto_url,
-                'photo_name': filename
+                'photo_name': interesado.foto_perfil.name
             })
 
         except Exception as e:
@@ -788,30 +797,9 @@ def descargar_cv_pdf(request):
         messages.warning(request, 'Primero debes crear tu CV.')
         return redirect('crear_editar_cv')
 
-    # Preparar datos para el PDF
-    context = {
-        'interesado': interesado,
-        'curriculum': curriculum,
-        'experiencias': curriculum.experiencias.all(),
-        'educaciones': curriculum.educaciones.all(),
-        'habilidades': curriculum.habilidades.all(),
-        'idiomas': curriculum.idiomas.all(),
-    }
-
-    # Renderizar HTML
-    html_string = render_to_string('usuarios/cv_pdf_template.html', context)
-
-    # Generar PDF
+    # Generar PDF (o transmitirlo desde la caché si el CV no ha cambiado)
     try:
-        html_doc = HTML(string=html_string)
-        pdf_bytes = html_doc.write_pdf()
-
-        # Preparar respuesta
-        response = HttpResponse(pdf_bytes, content_type='application/pdf')
-        filename = f"CV_{interesado.nombre}_{interesado.apellido_paterno}.pdf"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-
-        return response
+        return respuesta_cv_pdf(interesado, curriculum)
     except Exception as e:
         messages.error(request, f'Error al generar PDF: {str(e)}')
         return redirect('perfil_interesado')
@@ -842,16 +830,16 @@ def descargar_cv_pdf_reclutador(request):
 
     try:
         # Obtener el interesado
-        interesado = get_object_or_404(Interesado, id=interesado_id)
+        interesado = get_object_or_404(Interesado.objects.select_related('usuario'), id=interesado_id)
 
         # Verificar que el reclutador tenga permiso para ver este CV
         # (el interesado debe haberse postulado a alguna vacante del reclutador)
-        tiene_permiso = Postulacion.objects.filter(
+        postulacion = Postulacion.objects.filter(
             interesado=interesado,
             vacante__reclutador=request.user.reclutador
-        ).exists()
+        ).only('id', 'cv_instantanea').order_by('-fecha_postulacion').first()
 
-        if not tiene_permiso:
+        if postulacion is None:
             messages.error(request, 'No tienes permiso para descargar este CV.')
             return redirect('mis_vacantes')
 
@@ -862,35 +850,44 @@ def descargar_cv_pdf_reclutador(request):
 
         curriculum = interesado.curriculum
 
-        # Verificar que el CV tenga contenido mínimo
-        if not curriculum.resumen_profesional and not curriculum.experiencias.exists():
+        # Verificar que el CV tenga contenido mínimo (con la instantánea no se consultan las experiencias)
+        instantanea = postulacion.cv_instantanea
+        if instantanea:
+            incompleto = not instantanea['resumen_profesional'] and not instantanea['experiencias']
+        else:
+            incompleto = not curriculum.resumen_profesional and not curriculum.experiencias.exists()
+
+        if incompleto:
             messages.error(request, 'El CV de este interesado está incompleto.')
             return redirect('mis_vacantes')
 
-        # Preparar datos para el PDF
-        context = {
-            'interesado': interesado,
-            'curriculum': curriculum,
-            'experiencias': curriculum.experiencias.all(),
-            'educaciones': curriculum.educaciones.all(),
-            'habilidades': curriculum.habilidades.all(),
-            'idiomas': curriculum.idiomas.all(),
-        }
-
-        # Renderizar HTML usando el template existente
-        html_string = render_to_string('usuarios/cv_pdf_template.html', context)
-
-        # Generar PDF
+        # El PDF se genera desde la instantánea: el reclutador ve el CV tal como se
+        # envió. Si esa versión ya está generada se transmite desde la caché
         try:
-            html_doc = HTML(string=html_string)
-            pdf_bytes = html_doc.write_pdf()
+            if cv_pdf_en_cache(interesado, curriculum, postulacion):
+                return respuesta_cv_pdf(interesado, curriculum, postulacion)
 
-            # Preparar respuesta
-            response = HttpResponse(pdf_bytes, content_type='application/pdf')
-            filename = f"CV_{interesado.nombre}_{interesado.apellido_paterno}.pdf"
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
+            # Si no, se encola para el worker (manage.py procesar_pdfs) y la página
+            # consulta el estado del trabajo en lugar de bloquear este proceso
+            trabajo = encolar_cv_pdf(interesado, curriculum, postulacion)
+            estado_url = reverse('estado_cv_pdf', args=[trabajo.id])
+            descarga_url = f"{reverse('descargar_cv_pdf_reclutador')}?interesado_id={interesado.id}"
 
-            return response
+            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                return JsonResponse({
+                    'success': True,
+                    'trabajo_id': trabajo.id,
+                    'estado': trabajo.estado,
+                    'estado_url': estado_url,
+                    'descarga_url': descarga_url,
+                })
+
+            return render(request, 'usuarios/cv_pdf_preparando.html', {
+                'interesado': interesado,
+                'trabajo': trabajo,
+                'estado_url': estado_url,
+                'descarga_url': descarga_url,
+            })
 
         except Exception as e:
             messages.error(request, f'Error al generar PDF: {str(e)}')
@@ -904,6 +901,30 @@ def descargar_cv_pdf_reclutador(request):
         return redirect('mis_vacantes')
 
 
+@login_required
+@require_http_methods(["GET"])
+def estado_cv_pdf(request, trabajo_id):
+    """Vista AJAX que consulta el estado de un trabajo de generación de CV en PDF."""
+    if request.user.rol != 'reclutador' or not hasattr(request.user, 'reclutador'):
+        return JsonResponse({'success': False, 'error': 'No autorizado'}, status=403)
+
+    trabajo = get_object_or_404(TrabajoPDF, id=trabajo_id)
+
+    tiene_permiso = Postulacion.objects.filter(
+        interesado_id=trabajo.interesado_id,
+        vacante__reclutador=request.user.reclutador
+    ).exists()
+    if not tiene_permiso:
+        return JsonResponse({'success': False, 'error': 'No autorizado'}, status=403)
+
+    return JsonResponse({
+        'success': trabajo.estado != 'error',
+        'estado': trabajo.estado,
+        'error': trabajo.error if trabajo.estado == 'error' else None,
+        'descarga_url': f"{reverse('descargar_cv_pdf_reclutador')}?interesado_id={trabajo.interesado_id}",
+    })
+
+
 @method_decorator(login_required, name='dispatch')
 class PublicarVacanteView(View):
     """Vista para publicar una nueva vacante."""
@@ -1101,6 +1122,14 @@ class MisVacantesView(View):
         return render(request, 'usuarios/mis_vacantes.html', context)
 
 
+def _parametros_sin_cursor(request):
+    """Parámetros GET actuales (búsqueda y filtros) para armar los enlaces de paginación."""
+    parametros = request.GET.copy()
+    parametros.pop('cursor', None)
+    parametros.pop('page', None)
+    return parametros.urlencode()
+
+
 def index_view(request):
     """Vista de la página de inicio con vacantes publicadas y paginación."""
 
@@ -1111,26 +1140,22 @@ def index_view(request):
     vacantes_list = Vacante.objects.filter(
         estado_vacante='publicada',
         aprobada=True
-    ).select_related('secretaria', 'categoria').order_by('-fecha_publicacion')
+    ).select_related('secretaria', 'categoria').order_by('-fecha_publicacion', '-id')
 
-    # Aplicar búsqueda si existe
+    # Aplicar búsqueda si existe (índice GIN, ordenado por relevancia)
     if busqueda:
-        vacantes_list = vacantes_list.filter(
-            Q(titulo__icontains=busqueda) |
-            Q(categoria__nombre__icontains=busqueda) |
-            Q(municipio__icontains=busqueda)
-        )
+        vacantes_list = buscar_vacantes_texto(vacantes_list, busqueda)
 
-    # Configurar paginación - 5 vacantes por página
-    paginator = Paginator(vacantes_list, 5)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Paginación por cursor - 5 vacantes por página, con los IDs en caché
+    parametros = {'q': busqueda}
+    page_obj = pagina_cacheada('index', parametros, vacantes_list, 5, request.GET.get('cursor'))
 
     context = {
         'vacantes': page_obj,
         'page_obj': page_obj,
-        'total_vacantes': paginator.count,
+        'total_vacantes': contar_cacheado('index', parametros, vacantes_list),
         'busqueda': busqueda,
+        'parametros_busqueda': _parametros_sin_cursor(request),
     }
     return render(request, 'usuarios/index.html', context)
 
@@ -1223,6 +1248,8 @@ class PerfilInteresadoView(View):
             'idiomas': idiomas,
             'tiene_cv': tiene_cv,
             'es_nuevo': created,
+            # Precalculadas por generar_recomendaciones: una consulta, sin búsquedas
+            'recomendadas': vacantes_recomendadas(interesado),
         }
         return render(request, 'usuarios/perfil_interesado.html', context)
 
@@ -1294,28 +1321,24 @@ class DashboardReclutadorView(View):
 
         reclutador = request.user.reclutador
 
-        # Calcular estadísticas de vacantes
-        vacantes_activas = reclutador.vacantes.filter(estado_vacante='publicada').count()
-        vacantes_borradores = reclutador.vacantes.filter(estado_vacante='borrador').count()
-        vacantes_cerradas = reclutador.vacantes.filter(estado_vacante='cerrada').count()
-        total_vacantes = reclutador.vacantes.count()
+        # Calcular estadísticas de vacantes y postulaciones en una sola consulta
+        # (las postulaciones se leen de los contadores de cada vacante)
+        estadisticas = reclutador.vacantes.aggregate(
+            total_vacantes=Count('id'),
+            vacantes_activas=Count('id', filter=Q(estado_vacante='publicada')),
+            vacantes_borradores=Count('id', filter=Q(estado_vacante='borrador')),
+            vacantes_cerradas=Count('id', filter=Q(estado_vacante='cerrada')),
+            postulaciones_recibidas=Coalesce(Sum('num_postulaciones'), 0),
+            postulaciones_nuevas=Coalesce(Sum('num_enviadas'), 0),
+        )
 
         # Obtener las últimas 3 vacantes para mostrar en el dashboard
         ultimas_vacantes = reclutador.vacantes.all().order_by('-fecha_actualizacion')[:3]
 
-        # TODO: Cuando implementemos postulaciones, calcular estas estadísticas
-        postulaciones_recibidas = 0  # Placeholder
-        postulaciones_nuevas = 0  # Placeholder
-
         context = {
             'reclutador': reclutador,
-            'vacantes_activas': vacantes_activas,
-            'vacantes_borradores': vacantes_borradores,
-            'vacantes_cerradas': vacantes_cerradas,
-            'total_vacantes': total_vacantes,
             'ultimas_vacantes': ultimas_vacantes,
-            'postulaciones_recibidas': postulaciones_recibidas,
-            'postulaciones_nuevas': postulaciones_nuevas,
+            **estadisticas,
         }
         # return render(request, 'usuarios/dashboard_reclutador.html', context)'usuarios/dashboard_reclutador.html', context)
 
@@ -1394,31 +1417,50 @@ def postularse_vacante(request, vacante_id):
                 'redirect_url': '/perfil/interesado/'
             })
 
-        # Verificar si ya se postuló
-        if Postulacion.objects.filter(interesado=interesado, vacante=vacante).exists():
-            return JsonResponse({
-                'success': False,
-                'error': 'Ya te has postulado a esta vacante'
-            })
-
-        # Verificar límite de postulantes
-        postulaciones_actuales = vacante.postulaciones.count()
-        if postulaciones_actuales >= vacante.max_postulantes:
-            return JsonResponse({
-                'success': False,
-                'error': 'Esta vacante ya alcanzó el límite máximo de postulantes'
-            })
-
-        # Crear la postulación
         mensaje_motivacion = request.POST.get('mensaje_motivacion', '').strip()
+        error_ya_postulado = 'Ya te has postulado a esta vacante'
 
-        postulacion = Postulacion.objects.create(
-            interesado=interesado,
-            vacante=vacante,
-            curriculum=curriculum,
-            mensaje_motivacion=mensaje_motivacion,
-            estado='enviada'
-        )
+        # El CV se congela tal como está ahora; se arma antes de bloquear la vacante
+        cv_instantanea = instantanea_cv(interesado, curriculum)
+
+        try:
+            with transaction.atomic():
+                # Bloquear la fila de la vacante: las postulaciones simultáneas a la misma
+                # vacante esperan su turno, así la verificación del límite y la inserción
+                # (que incrementa num_postulaciones en usuarios/signals.py) no se intercalan
+                vacante = Vacante.objects.select_for_update().only(
+                    'id', 'max_postulantes', 'num_postulaciones'
+                ).get(id=vacante.id)
+
+                # Verificar si ya se postuló
+                if Postulacion.objects.filter(interesado=interesado, vacante=vacante).exists():
+                    return JsonResponse({'success': False, 'error': error_ya_postulado})
+
+                # Verificar límite de postulantes (contador mantenido en la vacante)
+                if vacante.num_postulaciones >= vacante.max_postulantes:
+                    return JsonResponse({
+                        'success': False,
+                        'error': 'Esta vacante ya alcanzó el límite máximo de postulantes'
+                    })
+
+                # Crear la postulación
+                postulacion = Postulacion.objects.create(
+                    interesado=interesado,
+                    vacante=vacante,
+                    curriculum=curriculum,
+                    mensaje_motivacion=mensaje_motivacion,
+                    estado='enviada',
+                    cv_instantanea=cv_instantanea
+                )
+        except IntegrityError:
+            # Doble clic que llegó por otra vía (unique_together interesado/vacante)
+            return JsonResponse({'success': False, 'error': error_ya_postulado})
+
+        # Generar el PDF del CV en segundo plano para que el reclutador lo encuentre listo
+        try:
+            precalentar_cv_pdf(interesado, curriculum, postulacion)
+        except Exception:
+            logger.exception('Error al encolar el PDF del CV del interesado %s', interesado.id)
 
         return JsonResponse({
             'success': True,
@@ -1445,7 +1487,8 @@ def mis_postulaciones(request):
     ).select_related('vacante', 'vacante__secretaria').order_by('-fecha_postulacion')
 
     context = {
-        'postulaciones': postulaciones
+        'postulaciones': postulaciones,
+        'recomendadas': vacantes_recomendadas(request.user.interesado)[:5],
     }
     return render(request, 'usuarios/mis_postulaciones.html', context)
 
@@ -1598,8 +1641,11 @@ def retirar_postulacion(request, postulacion_id):
         # Guardar información para el mensaje
         vacante_titulo = postulacion.vacante.titulo
 
-        # Eliminar la postulación
-        postulacion.delete()
+        # Eliminar la postulación junto con el ajuste de los contadores de la vacante.
+        # El evento se registra antes: al borrar, su referencia pasa a NULL y el historial queda
+        with transaction.atomic():
+            PostulacionEvento.desde_postulacion(postulacion, postulacion.estado, 'retirada').save()
+            postulacion.delete()
 
         # Mensaje de éxito
         success_msg = f'Has retirado exitosamente tu postulación para "{vacante_titulo}"'
@@ -1652,10 +1698,78 @@ def test_urls(request):
     })
 
 
-# Agregar estas vistas al final de usuarios/views.py
+# Postulantes por página en ver_postulantes (primera carga y "Cargar más")
+POSTULANTES_POR_PAGINA = 20
+
+# Opciones de orden del listado de postulantes -> llave del PaginadorCursor
+ORDENES_POSTULANTES = {
+    'fecha_desc': ['-fecha_postulacion', '-id'],
+    'fecha_asc': ['fecha_postulacion', 'id'],
+    'nombre_asc': ['nombre_orden', 'id'],
+    'nombre_desc': ['-nombre_orden', '-id'],
+    'coincidencia_desc': ['-puntaje_orden', '-id'],
+}
+
+
+def _postulaciones_listado(vacante):
+    """
+    Postulaciones de una vacante listas para la lista de postulantes.
+
+    El resumen y las habilidades salen de cv_instantanea (ya ordenadas de mayor
+    a menor nivel): cada página es un solo SELECT con el interesado, sin
+    importar cuántos postulantes haya y sin tocar las tablas del CV.
+    """
+    return Postulacion.objects.filter(
+        vacante=vacante
+    ).select_related(
+        'interesado'
+    ).order_by('-fecha_postulacion')
+
+
+def _filtrar_postulantes(postulaciones, parametros):
+    """
+    Aplica al listado de postulantes los filtros y el orden recibidos por GET.
+
+    Parámetros: estado, municipio (texto, tolera acentos y errores), habilidad
+    (texto que se busca en las habilidades y en el nombre) y orden (una clave de
+    ORDENES_POSTULANTES).
+    """
+    postulaciones = postulaciones.annotate(
+        nombre_orden=Lower(Concat(
+            'interesado__nombre', Value(' '),
+            'interesado__apellido_paterno', Value(' '),
+            'interesado__apellido_materno'
+        )),
+        # Sin NULL en la llave del cursor: una postulación recién llegada va al final
+        puntaje_orden=Coalesce('puntaje_coincidencia', Value(-1.0))
+    )
+
+    estado = parametros.get('estado', '')
+    if estado in dict(Postulacion.ESTADOS_POSTULACION):
+        postulaciones = postulaciones.filter(estado=estado)
+
+    municipio = parametros.get('municipio', '').strip()
+    if municipio:
+        postulaciones = postulaciones.filter(interesado__municipio__in=municipios_similares(municipio))
+
+    texto = parametros.get('habilidad', '').strip()
+    if texto:
+        # EXISTS en lugar de JOIN: no duplica filas ni altera el conteo de habilidades
+        con_habilidad = HabilidadInteresado.objects.filter(
+            curriculum=OuterRef('curriculum'),
+            habilidad__nombre__icontains=texto
+        )
+        postulaciones = postulaciones.filter(Q(Exists(con_habilidad)) | Q(nombre_orden__contains=texto.lower()))
+
+    orden = ORDENES_POSTULANTES.get(parametros.get('orden'), ORDENES_POSTULANTES['fecha_desc'])
+    return postulaciones.order_by(*orden)
+
+
+def _preparar_orden_postulantes(vacante, parametros):
+    """Antes de ordenar por coincidencia, puntúa en un solo paso las postulaciones pendientes."""
+    if parametros.get('orden') == 'coincidencia_desc':
+        calcular_puntajes(vacante)
 
-@method_decorator(login_required, name='dispatch')
-# Agregar estas vistas al final de usuarios/views.py
 
 @method_decorator(login_required, name='dispatch')
 class VerPostulantesView(View):
@@ -1676,8 +1790,9 @@ class VerPostulantesView(View):
 
         try:
             # Obtener la vacante y verificar que pertenezca al reclutador
+            # Las estadísticas vienen en la misma consulta (contadores + nuevos de hoy)
             vacante = get_object_or_404(
-                Vacante.objects.select_related('secretaria', 'categoria'),
+                anotar_nuevos_hoy(Vacante.objects.select_related('secretaria', 'categoria')),
                 id=vacante_id,
                 reclutador=request.user.reclutador
             )
@@ -1685,53 +1800,91 @@ class VerPostulantesView(View):
             messages.error(request, 'Vacante no encontrada o no tienes permiso para verla.')
             return redirect('mis_vacantes')
 
-        # Obtener todas las postulaciones para esta vacante
-        postulaciones = Postulacion.objects.filter(
-            vacante=vacante
-        ).select_related(
-            'interesado',
-            'curriculum'
-        ).prefetch_related(
-            'curriculum__habilidades__habilidad'
-        ).order_by('-fecha_postulacion')
-
-        # Calcular estadísticas
-        estadisticas = self._calcular_estadisticas(postulaciones)
+        # Solo la primera página; las siguientes (y los filtros) llegan por postulantes_vacante_ajax
+        _preparar_orden_postulantes(vacante, request.GET)
+        postulaciones = _filtrar_postulantes(_postulaciones_listado(vacante), request.GET)
+        page_obj = PaginadorCursor(postulaciones, POSTULANTES_POR_PAGINA).get_page(request.GET.get('cursor'))
 
         context = {
             'vacante': vacante,
-            'postulaciones': postulaciones,
-            'estadisticas': estadisticas,
+            'postulaciones': page_obj,
+            'estadisticas': estadisticas_de(vacante),
         }
 
         return render(request, 'usuarios/ver_postulantes.html', context)
 
-    def _calcular_estadisticas(self, postulaciones):
-        """
-        Calcula las estadísticas de las postulaciones.
-        """
-
-        total_postulantes = postulaciones.count()
-
-        # Contar postulaciones por estado
-        estados = postulaciones.values('estado').annotate(count=Count('estado'))
-        estado_counts = {estado['estado']: estado['count'] for estado in estados}
-
-        # Contar nuevos hoy
-        nuevos_hoy = postulaciones.filter(
-            fecha_postulacion__date=date.today()
-        ).count()
-
-        return {
-            'total_postulantes': total_postulantes,
-            'nuevos_hoy': nuevos_hoy,
-            'en_revision': estado_counts.get('en_revision', 0),
-            'entrevista': estado_counts.get('entrevista', 0),
-            'aceptados': estado_counts.get('aceptada', 0),
-            'rechazados': estado_counts.get('rechazada', 0),
-            'enviadas': estado_counts.get('enviada', 0),
-            'preseleccionados': estado_counts.get('preseleccionado', 0),
-        }
+
+@login_required
+@require_http_methods(["GET"])
+def postulantes_vacante_ajax(request, vacante_id):
+    """
+    Vista AJAX con una página del listado de postulantes de una vacante.
+
+    Acepta los filtros de _filtrar_postulantes y el `cursor` de la página
+    anterior. Devuelve el HTML de las tarjetas y el cursor de la siguiente página.
+    """
+    if request.user.rol != 'reclutador':
+        return JsonResponse({
+            'success': False,
+            'error': 'No tienes permisos para esta acción'
+        }, status=403)
+
+    if not hasattr(request.user, 'reclutador') or not request.user.reclutador.aprobado:
+        return JsonResponse({
+            'success': False,
+            'error': 'Tu cuenta de reclutador debe estar aprobada.'
+        }, status=403)
+
+    vacante = get_object_or_404(Vacante, id=vacante_id, reclutador=request.user.reclutador)
+
+    cursor = request.GET.get('cursor')
+    if not cursor:
+        _preparar_orden_postulantes(vacante, request.GET)
+    postulaciones = _filtrar_postulantes(_postulaciones_listado(vacante), request.GET)
+    page_obj = PaginadorCursor(postulaciones, POSTULANTES_POR_PAGINA).get_page(cursor)
+
+    html = render_to_string('usuarios/postulantes_lista.html', {'postulaciones': page_obj}, request=request)
+    return JsonResponse({
+        'success': True,
+        'html': html,
+        'cursor_siguiente': page_obj.cursor_siguiente,
+    })
+
+
+@login_required
+@require_http_methods(["GET"])
+def descargar_cvs_vacante(request, vacante_id):
+    """Vista para que el reclutador descargue en un ZIP los CV de todos los postulantes de una vacante."""
+    if request.user.rol != 'reclutador':
+        messages.error(request, 'No tienes permiso para descargar CVs.')
+        return redirect('index')
+
+    if not hasattr(request.user, 'reclutador') or not request.user.reclutador.aprobado:
+        messages.error(request, 'Tu cuenta de reclutador debe estar aprobada.')
+        return redirect('dashboard_reclutador')
+
+    vacante = get_object_or_404(Vacante, id=vacante_id, reclutador=request.user.reclutador)
+
+    postulaciones = Postulacion.objects.filter(
+        vacante=vacante
+    ).select_related(
+        'interesado__usuario',
+        'interesado__curriculum'
+    ).order_by('-fecha_postulacion')
+
+    postulaciones = [
+        postulacion for postulacion in postulaciones
+        if hasattr(postulacion.interesado, 'curriculum')
+    ]
+    if not postulaciones:
+        messages.warning(request, 'Ningún postulante de esta vacante tiene CV disponible.')
+        return redirect('ver_postulantes', vacante_id=vacante.id)
+
+    # El ZIP se envía mientras se arma: los PDF faltantes los genera el worker
+    # (manage.py procesar_pdfs) y se agregan conforme están listos
+    response = StreamingHttpResponse(zip_cvs_postulantes(postulaciones), content_type='application/zip')
+    response['Content-Disposition'] = f'attachment; filename="CVs_vacante_{vacante.id}.zip"'
+    return response
 
 
 @login_required
@@ -1765,48 +1918,25 @@ def cambiar_estado_postulacion(request, postulacion_id):
                 'error': 'Estado no válido'
             }, status=400)
 
-        # Obtener la postulación y verificar que pertenezca a una vacante del reclutador
-        postulacion = get_object_or_404(
-            Postulacion.objects.select_related('vacante', 'interesado'),
-            id=postulacion_id,
-            vacante__reclutador=request.user.reclutador
-        )
-
-        # Guardar el estado anterior para logging
-        estado_anterior = postulacion.estado
+        with transaction.atomic():
+            # Obtener la postulación y verificar que pertenezca a una vacante del reclutador.
+            # El bloqueo evita que dos cambios simultáneos descuenten el mismo estado anterior
+            postulacion = get_object_or_404(
+                Postulacion.objects.select_for_update(of=('self',)),
+                id=postulacion_id,
+                vacante__reclutador=request.user.reclutador
+            )
 
-        # Actualizar el estado
-        postulacion.estado = nuevo_estado
-        postulacion.save()
+            # Actualizar el estado (los contadores de la vacante y el PostulacionEvento
+            # del cambio se escriben en usuarios/signals.py)
+            postulacion.estado = nuevo_estado
+            postulacion.save()
 
         # Obtener el display name del nuevo estado
         estado_display = postulacion.get_estado_display()
 
-        # Calcular estadísticas actualizadas para la vacante
-
-        postulaciones_vacante = Postulacion.objects.filter(vacante=postulacion.vacante)
-
-        # Contar por estados
-        estados = postulaciones_vacante.values('estado').annotate(count=Count('estado'))
-        estado_counts = {estado['estado']: estado['count'] for estado in estados}
-
-        # Contar nuevos hoy
-        nuevos_hoy = postulaciones_vacante.filter(
-            fecha_postulacion__date=date.today()
-        ).count()
-
-        estadisticas = {
-            'total_postulantes': postulaciones_vacante.count(),
-            'nuevos_hoy': nuevos_hoy,
-            'en_revision': estado_counts.get('en_revision', 0),
-            'entrevista': estado_counts.get('entrevista', 0),
-            'aceptados': estado_counts.get('aceptada', 0),
-            'rechazados': estado_counts.get('rechazada', 0),
-        }
-
-        # Log de la acción (opcional)
-        print(f"Reclutador {request.user.email} cambió estado de postulación {postulacion_id} "
-              f"de '{estado_anterior}' a '{nuevo_estado}'")
+        # Estadísticas actualizadas de la vacante (una sola consulta a los contadores)
+        estadisticas = estadisticas_vacante(postulacion.vacante_id)
 
         return JsonResponse({
             'success': True,
@@ -1828,7 +1958,7 @@ def cambiar_estado_postulacion(request, postulacion_id):
             'error': 'Postulación no encontrada o no tienes permiso para modificarla'
         }, status=404)
     except Exception as e:
-        print(f"Error en cambiar_estado_postulacion: {str(e)}")
+        logger.exception('Error en cambiar_estado_postulacion')
         return JsonResponse({
             'success': False,
             'error': f'Error interno del servidor: {str(e)}'
@@ -1864,9 +1994,9 @@ def agregar_notas_postulacion(request, postulacion_id):
             vacante__reclutador=request.user.reclutador
         )
 
-        # Actualizar las notas
+        # Actualizar solo las notas (no pisar un cambio de estado simultáneo)
         postulacion.notas_reclutador = notas
-        postulacion.save()
+        postulacion.save(update_fields=['notas_reclutador', 'fecha_actualizacion'])
 
         return JsonResponse({
             'success': True,
@@ -1886,10 +2016,19 @@ def agregar_notas_postulacion(request, postulacion_id):
         }, status=500)
 
 
+# Máximo de postulaciones por operación masiva (una página grande de ver_postulantes)
+MAX_POSTULACIONES_LOTE = 200
+
+
 @login_required
-def cambiar_estado_postulacion(request, postulacion_id):
+def actualizar_postulaciones_lote(request):
     """
-    Vista AJAX para cambiar el estado de una postulación.
+    Vista AJAX para cambiar el estado y/o las notas de varias postulaciones a la vez.
+
+    Recibe {'postulacion_ids': [...], 'nuevo_estado': ..., 'notas': ...} (al menos
+    uno de los dos últimos). Todas las postulaciones deben ser de una misma
+    vacante del reclutador; se bloquean y validan en una sola consulta y se
+    guardan con un solo bulk_update dentro de una transacción.
     """
     if request.method != 'POST':
         return JsonResponse({
@@ -1897,7 +2036,6 @@ def cambiar_estado_postulacion(request, postulacion_id):
             'error': 'Método no permitido'
         }, status=405)
 
-    # Verificar que sea un reclutador
     if request.user.rol != 'reclutador':
         return JsonResponse({
             'success': False,
@@ -1907,110 +2045,112 @@ def cambiar_estado_postulacion(request, postulacion_id):
     try:
         import json
         data = json.loads(request.body)
-        nuevo_estado = data.get('nuevo_estado')
-
-        # Validar que el nuevo estado sea válido
-        estados_validos = [choice[0] for choice in Postulacion.ESTADOS_POSTULACION]
-        if nuevo_estado not in estados_validos:
+        if not isinstance(data, dict):
             return JsonResponse({
                 'success': False,
-                'error': 'Estado no válido'
+                'error': 'Datos JSON inválidos'
             }, status=400)
 
-        # Obtener la postulación y verificar que pertenezca a una vacante del reclutador
-        postulacion = get_object_or_404(
-            Postulacion.objects.select_related('vacante', 'interesado'),
-            id=postulacion_id,
-            vacante__reclutador=request.user.reclutador
-        )
+        ids = {int(postulacion_id) for postulacion_id in data.get('postulacion_ids', [])}
+        nuevo_estado = data.get('nuevo_estado') or None
+        notas = data.get('notas')
+        notas = notas.strip() if isinstance(notas, str) else None
 
-        # Guardar el estado anterior para logging
-        estado_anterior = postulacion.estado
-
-        # Actualizar el estado
-        postulacion.estado = nuevo_estado
-        postulacion.save()
-
-        # Obtener el display name del nuevo estado
-        estado_display = postulacion.get_estado_display()
-
-        # Log de la acción (opcional)
-        print(f"Reclutador {request.user.email} cambió estado de postulación {postulacion_id} "
-              f"de '{estado_anterior}' a '{nuevo_estado}'")
-
-        return JsonResponse({
-            'success': True,
-            'message': f'Estado actualizado exitosamente',
-            'estado_display': estado_display,
-            'postulacion_id': postulacion_id
-        })
-
-    except json.JSONDecodeError:
-        return JsonResponse({
-            'success': False,
-            'error': 'Datos JSON inválidos'
-        }, status=400)
-    except Postulacion.DoesNotExist:
-        return JsonResponse({
-            'success': False,
-            'error': 'Postulación no encontrada o no tienes permiso para modificarla'
-        }, status=404)
-    except Exception as e:
-        print(f"Error en cambiar_estado_postulacion: {str(e)}")
-        return JsonResponse({
-            'success': False,
-            'error': f'Error interno del servidor: {str(e)}'
-        }, status=500)
+        if not ids:
+            return JsonResponse({
+                'success': False,
+                'error': 'No seleccionaste postulaciones'
+            }, status=400)
 
+        if len(ids) > MAX_POSTULACIONES_LOTE:
+            return JsonResponse({
+                'success': False,
+                'error': f'Puedes actualizar como máximo {MAX_POSTULACIONES_LOTE} postulaciones a la vez'
+            }, status=400)
 
-@login_required
-def agregar_notas_postulacion(request, postulacion_id):
-    """
-    Vista AJAX para agregar notas del reclutador a una postulación.
-    """
-    if request.method != 'POST':
-        return JsonResponse({
-            'success': False,
-            'error': 'Método no permitido'
-        }, status=405)
+        estados_validos = [choice[0] for choice in Postulacion.ESTADOS_POSTULACION]
+        if nuevo_estado is not None and nuevo_estado not in estados_validos:
+            return JsonResponse({
+                'success': False,
+                'error': 'Estado no válido'
+            }, status=400)
 
-    if request.user.rol != 'reclutador':
-        return JsonResponse({
-            'success': False,
-            'error': 'No tienes permisos para esta acción'
-        }, status=403)
+        if nuevo_estado is None and notas is None:
+            return JsonResponse({
+                'success': False,
+                'error': 'Indica un estado o notas para actualizar'
+            }, status=400)
 
-    try:
-        import json
-        data = json.loads(request.body)
-        notas = data.get('notas', '').strip()
+        campos = ['fecha_actualizacion']
+        if nuevo_estado is not None:
+            campos.append('estado')
+        if notas is not None:
+            campos.append('notas_reclutador')
+
+        with transaction.atomic():
+            # Propiedad y bloqueo en una sola consulta
+            postulaciones = list(
+                Postulacion.objects.select_for_update(of=('self',)).filter(
+                    id__in=ids,
+                    vacante__reclutador=request.user.reclutador
+                ).only('id', 'vacante_id', 'estado', 'notas_reclutador', 'fecha_actualizacion')
+            )
 
-        # Obtener la postulación
-        postulacion = get_object_or_404(
-            Postulacion,
-            id=postulacion_id,
-            vacante__reclutador=request.user.reclutador
-        )
+            if len(postulaciones) != len(ids):
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Postulación no encontrada o no tienes permiso para modificarla'
+                }, status=404)
 
-        # Actualizar las notas
-        postulacion.notas_reclutador = notas
-        postulacion.save()
+            vacantes = {postulacion.vacante_id for postulacion in postulaciones}
+            if len(vacantes) != 1:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Las postulaciones deben ser de la misma vacante'
+                }, status=400)
+            vacante_id = vacantes.pop()
+
+            # bulk_update no aplica auto_now ni dispara post_save: los contadores y
+            # el historial de estados se escriben aquí, en la misma transacción
+            ahora = timezone.now()
+            anteriores = {}
+            eventos = []
+            for postulacion in postulaciones:
+                if nuevo_estado is not None and postulacion.estado != nuevo_estado:
+                    anteriores[postulacion.estado] = anteriores.get(postulacion.estado, 0) + 1
+                    eventos.append(PostulacionEvento.desde_postulacion(
+                        postulacion, postulacion.estado, nuevo_estado, fecha=ahora
+                    ))
+                    postulacion.estado = nuevo_estado
+                if notas is not None:
+                    postulacion.notas_reclutador = notas
+                postulacion.fecha_actualizacion = ahora
+
+            Postulacion.objects.bulk_update(postulaciones, campos)
+            if eventos:
+                ajustar_contadores_estado(vacante_id, anteriores, nuevo_estado)
+                PostulacionEvento.objects.bulk_create(eventos)
 
         return JsonResponse({
             'success': True,
-            'message': 'Notas guardadas exitosamente'
+            'message': f'{len(postulaciones)} postulaciones actualizadas',
+            'actualizadas': len(postulaciones),
+            'postulacion_ids': sorted(ids),
+            'nuevo_estado': nuevo_estado,
+            'estado_display': dict(Postulacion.ESTADOS_POSTULACION).get(nuevo_estado),
+            'estadisticas': estadisticas_vacante(vacante_id)
         })
 
-    except json.JSONDecodeError:
+    except (json.JSONDecodeError, TypeError, ValueError):
         return JsonResponse({
             'success': False,
             'error': 'Datos JSON inválidos'
         }, status=400)
     except Exception as e:
-        print(f"Error en agregar_notas_postulacion: {str(e)}")
+        logger.exception('Error en actualizar_postulaciones_lote')
         return JsonResponse({
             'success': False,
-            'error': f'Error interno: {str(e)}'
+            'error': f'Error interno del servidor: {str(e)}'
         }, status=500)
 
 
@@ -2040,45 +2180,46 @@ def ver_perfil_candidato(request, interesado_id):
             id=interesado_id
         )
 
-        # Verificar que el candidato se haya postulado a alguna vacante del reclutador
-        tiene_postulacion = Postulacion.objects.filter(
-            interesado=interesado,
-            vacante__reclutador=request.user.reclutador
-        ).exists()
+        # Postulaciones del candidato a vacantes del reclutador (también es la verificación de permiso)
+        postulaciones_relacionadas = list(
+            Postulacion.objects.filter(
+                interesado=interesado,
+                vacante__reclutador=request.user.reclutador
+            ).select_related('vacante').order_by('-fecha_postulacion')
+        )
 
-        if not tiene_postulacion:
+        if not postulaciones_relacionadas:
             messages.error(request, 'No tienes permiso para ver este perfil.')
             return redirect('dashboard_reclutador')
 
-        # Obtener o crear curriculum
-        curriculum = None
-        experiencias = []
-        educaciones = []
-        habilidades = []
-        idiomas = []
-
-        try:
-            curriculum = interesado.curriculum
-            experiencias = curriculum.experiencias.all().order_by('-fecha_inicio')
-            educaciones = curriculum.educaciones.all().order_by('-fecha_inicio')
-            habilidades = curriculum.habilidades.select_related('habilidad').all()
-            idiomas = curriculum.idiomas.all()
-        except Curriculum.DoesNotExist:
-            pass
-
-        # Obtener postulaciones del candidato a vacantes del reclutador
-        postulaciones_relacionadas = Postulacion.objects.filter(
-            interesado=interesado,
-            vacante__reclutador=request.user.reclutador
-        ).select_related('vacante').order_by('-fecha_postulacion')
+        # El CV se muestra tal como lo envió en su postulación más reciente
+        instantanea = postulaciones_relacionadas[0].cv_instantanea
+        if instantanea:
+            datos_cv = contexto_instantanea(instantanea)
+        else:
+            # Postulaciones anteriores a las instantáneas (ver generar_instantaneas_cv)
+            datos_cv = {
+                'curriculum': None,
+                'experiencias': [],
+                'educaciones': [],
+                'habilidades': [],
+                'idiomas': [],
+            }
+            try:
+                curriculum = interesado.curriculum
+                datos_cv = {
+                    'curriculum': curriculum,
+                    'experiencias': curriculum.experiencias.all().order_by('-fecha_inicio'),
+                    'educaciones': curriculum.educaciones.all().order_by('-fecha_inicio'),
+                    'habilidades': curriculum.habilidades.select_related('habilidad').all(),
+                    'idiomas': curriculum.idiomas.all(),
+                }
+            except Curriculum.DoesNotExist:
+                pass
 
         context = {
             'interesado': interesado,
-            'curriculum': curriculum,
-            'experiencias': experiencias,
-            'educaciones': educaciones,
-            'habilidades': habilidades,
-            'idiomas': idiomas,
+            **datos_cv,
             'postulaciones_relacionadas': postulaciones_relacionadas,
             'es_vista_reclutador': True,  # Flag para adaptar el template
         }
@@ -2094,52 +2235,89 @@ def ver_perfil_candidato(request, interesado_id):
 # Agregar estas vistas al archivo usuarios/views.py
 
 
+def _agregar_enlaces_facetas(request, facetas):
+    """Agrega a cada faceta los parámetros GET para activarla o quitarla."""
+    for dimension, opciones in facetas.items():
+        for opcion in opciones:
+            parametros = request.GET.copy()
+            parametros.pop('cursor', None)
+            parametros.pop('page', None)
+            if opcion['seleccionado']:
+                parametros.pop(dimension, None)
+            else:
+                parametros[dimension] = opcion['valor']
+            opcion['parametros'] = parametros.urlencode()
+
+
 def buscar_vacantes(request):
     """Vista para buscar vacantes con filtros y paginación."""
 
     # Obtener parámetros de búsqueda
     query = request.GET.get('q', '').strip()
     tipo_empleo = request.GET.get('tipo_empleo', '')
+    modalidad = request.GET.get('modalidad', '')
     municipio = request.GET.get('municipio', '')
+    categoria = request.GET.get('categoria', '')
+    if not categoria.isdigit():
+        categoria = ''
 
     # Comenzar con todas las vacantes publicadas y aprobadas
     vacantes_list = Vacante.objects.filter(
         estado_vacante='publicada',
         aprobada=True
-    ).select_related('secretaria', 'reclutador', 'categoria').order_by('-fecha_publicacion')
+    ).select_related('secretaria', 'reclutador', 'categoria').order_by('-fecha_publicacion', '-id')
 
-    # Aplicar filtro de búsqueda por texto
+    # Aplicar filtro de búsqueda por texto (título, requisitos, descripción,
+    # categoría, secretaría y municipio viven en search_vector: sin JOIN ni distinct)
     if query:
-        vacantes_list = vacantes_list.filter(
-            Q(titulo__icontains=query) |
-            Q(descripcion__icontains=query) |
-            Q(categoria__nombre__icontains=query) |
-            Q(secretaria__nombre__icontains=query) |
-            Q(requisitos__descripcion_requisitos__icontains=query) |
-            Q(requisitos__educacion_minima__icontains=query) |
-            Q(requisitos__experiencia_minima__icontains=query)
-        ).distinct()
+        vacantes_list = buscar_vacantes_texto(vacantes_list, query)
+
+    # Conteos por faceta sobre la búsqueda de texto, antes de aplicar los filtros
+    seleccion = {
+        'tipo_empleo': tipo_empleo,
+        'modalidad': modalidad,
+        'municipio': municipio,
+        'categoria': categoria,
+    }
+    parametros = dict(seleccion, q=query)
+    facetas = resultado_cacheado(
+        'buscar:facetas', parametros, lambda: calcular_facetas(vacantes_list, seleccion)
+    )
+    if facetas:
+        _agregar_enlaces_facetas(request, facetas)
 
     # Aplicar filtro por tipo de empleo
     if tipo_empleo:
         vacantes_list = vacantes_list.filter(tipo_empleo=tipo_empleo)
 
+    # Aplicar filtro por modalidad
+    if modalidad:
+        vacantes_list = vacantes_list.filter(modalidad=modalidad)
+
     # Aplicar filtro por municipio
     if municipio:
         vacantes_list = vacantes_list.filter(municipio=municipio)
 
-    # Configurar paginación - 5 vacantes por página
-    paginator = Paginator(vacantes_list, 5)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Aplicar filtro por categoría
+    if categoria:
+        vacantes_list = vacantes_list.filter(categoria_id=categoria)
+
+    # Paginación por cursor - 5 vacantes por página, con los IDs en caché
+    page_obj = pagina_cacheada('buscar', parametros, vacantes_list, 5, request.GET.get('cursor'))
+    total_resultados = contar_cacheado('buscar', parametros, vacantes_list)
 
     context = {
         'vacantes': page_obj,
         'page_obj': page_obj,
         'query': query,
         'tipo_empleo': tipo_empleo,
+        'modalidad': modalidad,
         'municipio': municipio,
-        'total_resultados': paginator.count,
+        'categoria': categoria,
+        'facetas': facetas,
+        'total_resultados': total_resultados,
+        'total_vacantes': total_resultados,
+        'parametros_busqueda': _parametros_sin_cursor(request),
     }
 
     return render(request, 'usuarios/index.html', context)
@@ -2153,15 +2331,38 @@ def busqueda_vacantes_ajax(request):
     vacantes = Vacante.objects.filter(
         estado_vacante='publicada',
         aprobada=True
-    ).select_related('secretaria', 'categoria')
+    ).select_related('secretaria', 'categoria').order_by('-fecha_publicacion')
 
     if busqueda:
-        vacantes = vacantes.filter(
-            Q(titulo__icontains=busqueda) |
-            Q(municipio__icontains=busqueda)
-        )
+        vacantes = buscar_vacantes_texto(vacantes, busqueda)
 
-    vacantes = vacantes.order_by('-fecha_publicacion')[:12]
+    # Las primeras 12 coincidencias se sirven desde la caché de búsquedas
+    vacantes = pagina_cacheada('ajax', {'q': busqueda}, vacantes, 12)
 
     html = render_to_string('usuarios/vacantes_lista.html', {'vacantes': vacantes})
-    return JsonResponse({'html': html})
\ No newline at end of file
+    return JsonResponse({'html': html})
+
+
+@require_http_methods(["GET"])
+def autocompletar_vacantes(request):
+    """
+    Vista AJAX de autocompletado para el cuadro de búsqueda.
+
+    Responde desde el trie en memoria (usuarios/autocompletado.py) sin consultar la
+    base de datos; la búsqueda completa solo se ejecuta al enviar el formulario.
+    """
+    prefijo = request.GET.get('q', '')[:100]
+    return JsonResponse({'sugerencias': sugerencias(prefijo)})
+
+
+def servir_media(request, path, document_root=None, show_indexes=False):
+    """
+    Sirve MEDIA_ROOT en desarrollo (DEBUG).
+
+    Los archivos nombrados por su contenido (usuarios/storage.py) nunca cambian,
+    así que el navegador puede guardarlos un año sin volver a validarlos.
+    """
+    response = serve(request, path, document_root=document_root, show_indexes=show_indexes)
+    if es_nombre_contenido(path):
+        response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response